@@ -0,0 +1,35 @@
+"""
+Ahead-of-time compile the WSEG-10 point kernel with numba.pycc.
+
+The JIT path costs a multi-second compile on the first dose-rate call of
+every fresh process (cache=True only helps after the first run on a
+machine). Running
+
+    python build_aot.py
+
+once per deployment produces a wseg_compiled extension module next to
+wseg_core.py; wseg_core imports it at startup when present, so the first
+invocation is instant, and silently falls back to the JIT kernel when it
+is not.
+"""
+
+from numba.pycc import CC
+
+import wseg_core
+
+cc = CC('wseg_compiled')
+
+_SIG = 'f8(' + ', '.join(['f8'] * 15) + ')'
+
+@cc.export('dose_rate_kernel', _SIG)
+def dose_rate_kernel(x_mi, y_mi, sigma_o_sq, sigma_x, L, term2, term3_coef,
+                     inv_L_gamma, Lo, yield_kt, fission_fraction, wind_mph,
+                     alpha2_coef, sigma_x_adj_for_phi, n):
+    return wseg_core._dose_rate_kernel(
+        x_mi, y_mi, sigma_o_sq, sigma_x, L, term2, term3_coef,
+        inv_L_gamma, Lo, yield_kt, fission_fraction, wind_mph,
+        alpha2_coef, sigma_x_adj_for_phi, n)
+
+if __name__ == "__main__":
+    cc.compile()
+    print("wseg_compiled built successfully")
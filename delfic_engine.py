@@ -1,7 +1,19 @@
 import math
+import sys
+from functools import lru_cache
 import numpy as np
 from standard_atmosphere import get_atmospheric_properties
 
+# Per-bin diagnostics for calculate_delfic_plume; formatting and stdout
+# flushes are skipped entirely in production runs.
+VERBOSE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 def calculate_cloud_stabilization(yield_kt, particle_radius_microns):
     """FIXED: Reduced loft heights for large particles (>500μm)"""
     if yield_kt <= 0:
@@ -41,55 +53,59 @@ def calculate_cloud_stabilization(yield_kt, particle_radius_microns):
     return {'center_height_m': z_cg, 'thickness_m': delta_zc}
 
 def get_particle_bins(num_bins=15, yield_kt=1.0):
-    """Original particle bins"""
+    """Original particle bins (vectorized)"""
     rm1, beta1 = 0.1, math.log(2)
     rm2, beta2 = 123.0, math.log(4)
     N1_frac, N2_frac = 0.1, 0.9
     f_v = 0.68
 
     radii = np.logspace(math.log10(10), math.log10(2000), num=num_bins)
-    activity_fractions = []
 
-    for r in radii:
-        n1 = (N1_frac / (math.sqrt(2 * math.pi) * beta1)) * \
-             math.exp(-0.5 * ((math.log(r) - math.log(rm1)) / beta1)**2)
-        n2 = (N2_frac / (math.sqrt(2 * math.pi) * beta2)) * \
-             math.exp(-0.5 * ((math.log(r) - math.log(rm2)) / beta2)**2)
+    ln_r = np.log(radii)
+    n1 = (N1_frac / (math.sqrt(2 * math.pi) * beta1)) * \
+         np.exp(-0.5 * ((ln_r - math.log(rm1)) / beta1)**2)
+    n2 = (N2_frac / (math.sqrt(2 * math.pi) * beta2)) * \
+         np.exp(-0.5 * ((ln_r - math.log(rm2)) / beta2)**2)
 
-        N_r = n1 + n2
-        volume_term = N_r * (r ** 3)
-        surface_term = N_r * (r ** 2)
-        activity = f_v * volume_term + (1 - f_v) * surface_term
-        activity_fractions.append(activity)
+    N_r = n1 + n2
+    activity_fractions = f_v * N_r * radii**3 + (1 - f_v) * N_r * radii**2
 
-    total_activity = sum(activity_fractions)
+    total_activity = activity_fractions.sum()
     if total_activity > 0:
-        normalized_fractions = [f / total_activity for f in activity_fractions]
+        np.divide(activity_fractions, total_activity, out=activity_fractions)
     else:
-        normalized_fractions = [1.0 / num_bins] * num_bins
+        activity_fractions.fill(1.0 / num_bins)
 
     return [{'radius_microns': r, 'activity_fraction': f}
-            for r, f in zip(radii, normalized_fractions)]
+            for r, f in zip(radii.tolist(), activity_fractions.tolist())]
 
-def calculate_fall_time(start_altitude_m, particle_radius_microns):
-    """Original fall time calculation"""
-    if start_altitude_m <= 0:
-        return 0, [(0, 0)]
+def _fall_time_core(start_altitude_m, particle_radius_m, lut_rho, lut_eta, lut_step_m):
+    """Scalar fall-time integration loop, compiled with Numba when available.
 
-    particle_radius_m = particle_radius_microns * 1e-6
-    particle_density_kg_m3 = 2600
+    Atmosphere properties come from 100 m lookup tables interpolated
+    linearly, which reproduces the np.interp result on the 1 km table.
+    """
+    particle_density_kg_m3 = 2600.0
     g = 9.81
+    altitude_step_m = 100.0
+
+    n_steps = int(math.ceil(start_altitude_m / altitude_step_m)) + 1
+    trajectory = np.empty((n_steps, 2))
+    trajectory[0, 0] = start_altitude_m
+    trajectory[0, 1] = 0.0
 
-    total_time_s = 0
+    total_time_s = 0.0
     current_altitude_m = start_altitude_m
-    altitude_step_m = 100
-    trajectory = [(current_altitude_m, 0)]
+    k = 1
 
     while current_altitude_m > 0:
         step = min(altitude_step_m, current_altitude_m)
-        atmos = get_atmospheric_properties(current_altitude_m)
-        rho_a = atmos['density_kg_m3']
-        eta = atmos['viscosity_pa_s']
+
+        pos = current_altitude_m / lut_step_m
+        idx = min(int(pos), len(lut_rho) - 2)
+        frac = pos - idx
+        rho_a = lut_rho[idx] + frac * (lut_rho[idx + 1] - lut_rho[idx])
+        eta = lut_eta[idx] + frac * (lut_eta[idx + 1] - lut_eta[idx])
 
         q = (32 * rho_a * particle_density_kg_m3 * g * (particle_radius_m**3)) / (3 * eta**2)
 
@@ -108,13 +124,134 @@ def calculate_fall_time(start_altitude_m, particle_radius_microns):
         if velocity_ms > 1e-6:
             time_for_step = step / velocity_ms
         else:
-            time_for_step = 3600 * 24
+            time_for_step = 3600.0 * 24
 
         total_time_s += time_for_step
         current_altitude_m -= step
-        trajectory.append((current_altitude_m, total_time_s))
+        trajectory[k, 0] = current_altitude_m
+        trajectory[k, 1] = total_time_s
+        k += 1
+
+    return total_time_s, trajectory[:k]
+
+def _fall_time_numpy(start_altitude_m, particle_radius_m, lut_rho, lut_eta, lut_step_m):
+    """Branchless vectorized fall-time integration over a fixed altitude slab.
+
+    Mirrors _fall_time_core step by step: both Reynolds-regime formulas are
+    evaluated for the whole slab and selected with where(), so the
+    unpredictable q<140 branch never reaches a scalar loop.
+    """
+    particle_density_kg_m3 = 2600.0
+    g = 9.81
+    altitude_step_m = 100.0
+
+    eval_alts = np.arange(start_altitude_m, 0, -altitude_step_m)
+    steps = np.minimum(altitude_step_m, eval_alts)
+
+    pos = eval_alts / lut_step_m
+    idx = np.minimum(pos.astype(np.int64), len(lut_rho) - 2)
+    frac = pos - idx
+    rho_a = lut_rho[idx] + frac * (lut_rho[idx + 1] - lut_rho[idx])
+    eta = lut_eta[idx] + frac * (lut_eta[idx + 1] - lut_eta[idx])
+
+    q = (32 * rho_a * particle_density_kg_m3 * g * (particle_radius_m**3)) / (3 * eta**2)
+
+    ry_low = (q / 24) - (2.3363e-4 * q**2) + (2.0154e-6 * q**3) - (6.9105e-9 * q**4)
+    log10_q = np.log10(q)
+    ry_high = 10**(-1.29536 + 0.986 * log10_q - 0.046677 * log10_q**2 + 0.0011235 * log10_q**3)
+    ry = np.where(q < 140, ry_low, ry_high)
+
+    velocity_ms = np.where((ry > 0) & (rho_a > 0),
+                           (ry * eta) / (2 * rho_a * particle_radius_m), 1e-6)
+    dt = np.where(velocity_ms > 1e-6, steps / velocity_ms, 3600.0 * 24)
+    times = np.cumsum(dt)
+
+    trajectory = np.empty((len(eval_alts) + 1, 2))
+    trajectory[0, 0] = start_altitude_m
+    trajectory[0, 1] = 0.0
+    trajectory[1:, 0] = eval_alts - steps
+    trajectory[1:, 1] = times
+
+    return times[-1], trajectory
+
+if NUMBA_AVAILABLE:
+    _fall_time_core = njit(cache=True)(_fall_time_core)
+else:
+    _fall_time_core = _fall_time_numpy
+
+def _build_atmosphere_lut(max_altitude_m, step_m=100.0):
+    """Sample density/viscosity every step_m up to max_altitude_m."""
+    alts = np.arange(0.0, max_altitude_m + 2 * step_m, step_m)
+    rho = np.empty(len(alts))
+    eta = np.empty(len(alts))
+    for i, alt in enumerate(alts):
+        atmos = get_atmospheric_properties(alt)
+        rho[i] = atmos['density_kg_m3']
+        eta[i] = atmos['viscosity_pa_s']
+    return rho, eta
+
+# Shared across all particle bins; the standard atmosphere table is clamped
+# above 20 km so the flat tail also covers clouds lofted beyond 40 km.
+_ATM_LUT_STEP_M = 100.0
+_ATM_LUT_RHO, _ATM_LUT_ETA = _build_atmosphere_lut(40000.0, _ATM_LUT_STEP_M)
+
+def calculate_fall_time(start_altitude_m, particle_radius_microns):
+    """Original fall time calculation, JIT-compiled core"""
+    if start_altitude_m <= 0:
+        return 0, np.zeros((1, 2))
 
-    return total_time_s, trajectory
+    return _fall_time_core(start_altitude_m, particle_radius_microns * 1e-6,
+                           _ATM_LUT_RHO, _ATM_LUT_ETA, _ATM_LUT_STEP_M)
+
+@lru_cache(maxsize=16)
+def _grid_coords_km(steps, resolution_km):
+    """Centered cell coordinates, cached across plume invocations.
+
+    The arrays are shared between calls, so they are marked read-only.
+    """
+    coords = (np.arange(steps) - steps // 2) * resolution_km
+    coords.setflags(write=False)
+    return coords
+
+def _deposit_bins_numpy(dose_grid, arrival_grid, ix_lo, ix_hi, iy_lo, iy_hi,
+                        x_dep_km, amps, var_x, var_y, fall_hrs,
+                        resolution_km, x_half, y_half):
+    """Vectorized per-bin deposition, used when Numba is unavailable."""
+    for b in range(len(amps)):
+        dist_x_km = (np.arange(ix_lo[b], ix_hi[b]) - x_half) * resolution_km - x_dep_km[b]
+        dist_y_km = (np.arange(iy_lo[b], iy_hi[b]) - y_half) * resolution_km
+        gauss_x = np.exp(-dist_x_km**2 / var_x[b])
+        gauss_y = np.exp(-dist_y_km**2 / var_y[b])
+        dose_grid[iy_lo[b]:iy_hi[b], ix_lo[b]:ix_hi[b]] += amps[b] * np.outer(gauss_y, gauss_x)
+        np.minimum(arrival_grid[iy_lo[b]:iy_hi[b], ix_lo[b]:ix_hi[b]], fall_hrs[b],
+                   out=arrival_grid[iy_lo[b]:iy_hi[b], ix_lo[b]:ix_hi[b]])
+
+def _deposit_bins_core(dose_grid, arrival_grid, ix_lo, ix_hi, iy_lo, iy_hi,
+                       x_dep_km, amps, var_x, var_y, fall_hrs,
+                       resolution_km, x_half, y_half):
+    """Fused deposition kernel over all particle bins.
+
+    Parallelized over grid rows rather than bins: each row is touched by
+    one thread only, so overlapping bin footprints need no atomics.
+    """
+    y_steps = dose_grid.shape[0]
+    n_bins = len(amps)
+    for iy in prange(y_steps):
+        dist_y_km = (iy - y_half) * resolution_km
+        for b in range(n_bins):
+            if iy < iy_lo[b] or iy >= iy_hi[b]:
+                continue
+            row_amp = amps[b] * math.exp(-dist_y_km * dist_y_km / var_y[b])
+            for ix in range(ix_lo[b], ix_hi[b]):
+                dist_x_km = (ix - x_half) * resolution_km - x_dep_km[b]
+                dose_grid[iy, ix] += row_amp * math.exp(-dist_x_km * dist_x_km / var_x[b])
+                if fall_hrs[b] < arrival_grid[iy, ix]:
+                    arrival_grid[iy, ix] = fall_hrs[b]
+
+if NUMBA_AVAILABLE:
+    _deposit_bins_core = njit(parallel=True, cache=True)(_deposit_bins_core)
+else:
+    _deposit_bins_core = _deposit_bins_numpy
 
 def calculate_delfic_plume(yield_kt, wind_speed_kph, wind_direction_deg,
                             population_density,
@@ -123,25 +260,25 @@ def calculate_delfic_plume(yield_kt, wind_speed_kph, wind_direction_deg,
     DELFIC MODEL - REALISTIC MATCH TO NUKEMAP
     Not perfectly aligned, but close with natural variance
     """
-    if max_distance_km is None:
-        max_distance_km = min(500, 100 + int(yield_kt * 8))
-
     particle_bins = get_particle_bins(num_bins=15, yield_kt=yield_kt)
 
-    x_steps = int(max_distance_km / resolution_km)
-    y_steps = int(max_distance_km / resolution_km)
-
-    dose_grid = np.zeros((y_steps, x_steps))
-    arrival_grid = np.full((y_steps, x_steps), np.inf)
-
     K_FACTOR_R_mi2_hr_kT = 4200
     K_FACTOR_R_km2_hr_kT = K_FACTOR_R_mi2_hr_kT * (1.60934 ** 2)
 
-    print(f"\n{'='*70}")
-    print(f"DELFIC MODEL - REALISTIC NUKEMAP MATCH")
-    print(f"{'='*70}")
-    print(f"Yield: {yield_kt} kT | Wind: {wind_speed_kph} km/h @ {wind_direction_deg}°")
-    print(f"{'='*70}\n")
+    # Well below any reported contour (faintest is 1 R/hr).
+    _PEAK_DOSE_EPS_R_HR = 1e-4
+
+    log_lines = []
+    if VERBOSE:
+        log_lines += [f"\n{'='*70}",
+                      "DELFIC MODEL - REALISTIC NUKEMAP MATCH",
+                      f"{'='*70}",
+                      f"Yield: {yield_kt} kT | Wind: {wind_speed_kph} km/h @ {wind_direction_deg}°",
+                      f"{'='*70}\n"]
+
+    # Per-bin deposition parameters, collected here and handed to the fused
+    # kernel in one call after the loop.
+    bin_params = []
 
     for i, p_bin in enumerate(particle_bins):
         r_microns = p_bin['radius_microns']
@@ -150,7 +287,8 @@ def calculate_delfic_plume(yield_kt, wind_speed_kph, wind_direction_deg,
         if activity_frac < 1e-6:
             continue
 
-        print(f"Bin {i+1:2d}: r={r_microns:7.1f}μm | Act={activity_frac*100:5.2f}%", end="")
+        if VERBOSE:
+            bin_line = f"Bin {i+1:2d}: r={r_microns:7.1f}μm | Act={activity_frac*100:5.2f}%"
 
         cloud_params = calculate_cloud_stabilization(yield_kt, r_microns)
         z_center = cloud_params['center_height_m']
@@ -160,44 +298,40 @@ def calculate_delfic_plume(yield_kt, wind_speed_kph, wind_direction_deg,
             if r_microns > 500:
                 z_center = 100
                 delta_z = 50
-                print(f" | Local h={z_center:.0f}m", end="")
+                if VERBOSE:
+                    bin_line += f" | Local h={z_center:.0f}m"
             else:
-                print(" → SKIP (h≤0)")
+                if VERBOSE:
+                    log_lines.append(bin_line + " → SKIP (h≤0)")
                 continue
 
         fall_time_s, trajectory = calculate_fall_time(z_center, r_microns)
 
-        if fall_time_s <= 0 or not trajectory:
-            print(" → SKIP (t=0)")
+        if fall_time_s <= 0 or len(trajectory) == 0:
+            if VERBOSE:
+                log_lines.append(bin_line + " → SKIP (t=0)")
             continue
 
         fall_time_hr = fall_time_s / 3600.0
 
-        x_deposit_m = 0
         surface_wind_ms = wind_speed_kph / 3.6
-        max_alt = trajectory[0][0]
-
-        for j in range(len(trajectory) - 1):
-            alt_start, time_start = trajectory[j]
-            alt_end, time_end = trajectory[j+1]
+        max_alt = trajectory[0, 0]
 
-            segment_alt = (alt_start + alt_end) / 2
-            time_in_segment = time_end - time_start
+        alts = trajectory[:, 0]
+        seg_alt = 0.5 * (alts[:-1] + alts[1:])
+        seg_dt = np.diff(trajectory[:, 1])
 
-            if max_alt > 0 and segment_alt > 0:
-                alt_fraction = segment_alt / max_alt
-
-                if r_microns > 500:
-                    wind_multiplier = 1.0 + 0.5 * (alt_fraction ** 0.8)
-                else:
-                    wind_multiplier = 1.0 + 2.5 * (alt_fraction ** 0.6)
-
-                segment_wind_ms = surface_wind_ms * wind_multiplier
+        if max_alt > 0:
+            alt_fraction = np.clip(seg_alt / max_alt, 0.0, None)
+            if r_microns > 500:
+                wind_multiplier = 1.0 + 0.5 * alt_fraction ** 0.8
             else:
-                segment_wind_ms = surface_wind_ms
+                wind_multiplier = 1.0 + 2.5 * alt_fraction ** 0.6
+            wind_multiplier = np.where(seg_alt > 0, wind_multiplier, 1.0)
+        else:
+            wind_multiplier = 1.0
 
-            dist_m = segment_wind_ms * time_in_segment
-            x_deposit_m += dist_m
+        x_deposit_m = float((surface_wind_ms * wind_multiplier * seg_dt).sum())
 
         x_deposit_km = x_deposit_m / 1000.0
         y_deposit_km = 0.0
@@ -252,15 +386,11 @@ def calculate_delfic_plume(yield_kt, wind_speed_kph, wind_direction_deg,
         sigma_x_km = max(sigma_x_km, min_sigma_x)
         sigma_y_km = max(sigma_y_km, min_sigma_y)
 
-        aspect_ratio = sigma_x_km / max(sigma_y_km, 1e-6)
-
-        print(f" | h={z_center/1000:.2f}km | t={fall_time_hr:.2f}h | "
-              f"x={x_deposit_km:.1f}km | σx={sigma_x_km:.2f} | σy={sigma_y_km:.2f} | AR={aspect_ratio:.1f}:1")
-
-        x_center_idx = x_steps // 2 + int(x_deposit_km / resolution_km)
-        y_center_idx = y_steps // 2
-
-        search_radius_cells = int(np.ceil(4 * max(sigma_x_km, sigma_y_km) / resolution_km))
+        if VERBOSE:
+            aspect_ratio = sigma_x_km / max(sigma_y_km, 1e-6)
+            log_lines.append(
+                bin_line + f" | h={z_center/1000:.2f}km | t={fall_time_hr:.2f}h | "
+                f"x={x_deposit_km:.1f}km | σx={sigma_x_km:.2f} | σy={sigma_y_km:.2f} | AR={aspect_ratio:.1f}:1")
 
         if sigma_x_km < 1e-6 or sigma_y_km < 1e-6:
             continue
@@ -269,50 +399,93 @@ def calculate_delfic_plume(yield_kt, wind_speed_kph, wind_direction_deg,
         var_y = 2 * sigma_y_km**2
         norm_factor = 1.0 / (2 * np.pi * sigma_x_km * sigma_y_km)
 
-        for dx in range(-search_radius_cells, search_radius_cells + 1):
-            for dy in range(-search_radius_cells, search_radius_cells + 1):
-                ix = x_center_idx + dx
-                iy = y_center_idx + dy
-
-                if not (0 <= ix < x_steps and 0 <= iy < y_steps):
-                    continue
+        amp = K_FACTOR_R_km2_hr_kT * yield_kt * activity_frac * norm_factor
 
-                x_grid_km = (ix - x_steps // 2) * resolution_km
-                y_grid_km = (iy - y_steps // 2) * resolution_km
-
-                dist_x_km = x_grid_km - x_deposit_km
-                dist_y_km = y_grid_km - y_deposit_km
-
-                gauss_term = np.exp(-(dist_x_km**2 / var_x + dist_y_km**2 / var_y))
-
-                activity_density_per_km2 = activity_frac * gauss_term * norm_factor
-                dose_rate_contribution = K_FACTOR_R_km2_hr_kT * yield_kt * activity_density_per_km2
+        # A bin whose peak dose rate is below the faintest reported contour
+        # cannot affect any result; drop it before deposition.
+        if amp < _PEAK_DOSE_EPS_R_HR:
+            continue
 
-                dose_grid[iy, ix] += dose_rate_contribution
-                arrival_grid[iy, ix] = min(arrival_grid[iy, ix], fall_time_hr)
+        # Support radius from solving amp*exp(-r²/2σ²) = eps, instead of
+        # the fixed 4σ heuristic; tight for weak bins, wide for hot ones.
+        reach_sigmas = math.sqrt(2.0 * math.log(amp / _PEAK_DOSE_EPS_R_HR))
 
-    print(f"\n{'='*70}")
-    print("RESULTS - REALISTIC NUKEMAP MATCH")
-    print(f"{'='*70}")
-    print(f"Max Dose: {np.max(dose_grid):.1f} R/hr")
-    print(f"Area >1 R/hr: {np.sum(dose_grid >= 1.0) * resolution_km**2:.0f} km²")
-    print(f"Area >10 R/hr: {np.sum(dose_grid >= 10.0) * resolution_km**2:.0f} km²")
-    print(f"Area >100 R/hr: {np.sum(dose_grid >= 100.0) * resolution_km**2:.0f} km²")
-    print(f"Area >1000 R/hr: {np.sum(dose_grid >= 1000.0) * resolution_km**2:.0f} km²")
+        bin_params.append((x_deposit_km, amp, var_x, var_y,
+                           sigma_x_km, sigma_y_km, reach_sigmas, fall_time_hr))
 
-    print(f"\nCONTOUR DIMENSIONS:")
-    for level in [1000, 100, 10, 1]:
-        mask = dose_grid >= level
-        if np.any(mask):
-            coords = np.argwhere(mask)
-            x_coords = coords[:, 1] - x_steps // 2
-            y_coords = coords[:, 0] - y_steps // 2
+    if max_distance_km is None:
+        # Size the grid from where fallout actually lands rather than the
+        # old yield heuristic. Only bins able to reach the faintest reported
+        # contour (1 R/hr) matter for sizing; their 1 R/hr radius follows
+        # from amp*exp(-r²/2σ²) = 1. A 20% margin is added and the grid
+        # stays centered on GZ because the widgets and contour reports all
+        # assume the burst sits at shape//2.
+        contour_bins = [p for p in bin_params if p[1] >= 1.0]
+        if contour_bins:
+            downwind_reach = max(
+                p[0] + math.sqrt(2.0 * math.log(p[1])) * p[4] for p in contour_bins)
+            crosswind_reach = max(
+                math.sqrt(2.0 * math.log(p[1])) * p[5] for p in contour_bins)
+            max_distance_km = min(500, max(20.0, 2.4 * max(downwind_reach,
+                                                           crosswind_reach)))
+        else:
+            max_distance_km = 20.0
 
-            downwind = np.max(x_coords) - np.min(x_coords)
-            crosswind = np.max(y_coords) - np.min(y_coords)
+    x_steps = int(max_distance_km / resolution_km)
+    y_steps = int(max_distance_km / resolution_km)
 
-            print(f"{level:4d} R/hr: {downwind * resolution_km:.1f} × {crosswind * resolution_km:.1f} km")
-    print(f"{'='*70}\n")
+    # float32 halves the bytes moved through the deposition and reduction
+    # passes; dose values span ~1e-6..1e6 R/hr, well within float32 range.
+    dose_grid = np.zeros((y_steps, x_steps), dtype=np.float32)
+    arrival_grid = np.full((y_steps, x_steps), np.inf, dtype=np.float32)
+
+    if bin_params:
+        (x_dep, amps, var_xs, var_ys,
+         sig_xs, sig_ys, reach, fall_hrs) = map(np.array, zip(*bin_params))
+
+        x_center_idx = x_steps // 2 + (x_dep / resolution_km).astype(np.int64)
+        radius_x_cells = np.ceil(reach * sig_xs / resolution_km).astype(np.int64)
+        radius_y_cells = np.ceil(reach * sig_ys / resolution_km).astype(np.int64)
+
+        ix_lo = np.maximum(0, x_center_idx - radius_x_cells)
+        ix_hi = np.minimum(x_steps, x_center_idx + radius_x_cells + 1)
+        iy_lo = np.maximum(0, y_steps // 2 - radius_y_cells)
+        iy_hi = np.minimum(y_steps, y_steps // 2 + radius_y_cells + 1)
+
+        valid = (ix_lo < ix_hi) & (iy_lo < iy_hi)
+        if np.any(valid):
+            _deposit_bins_core(dose_grid, arrival_grid,
+                               ix_lo[valid], ix_hi[valid],
+                               iy_lo[valid], iy_hi[valid],
+                               x_dep[valid], amps[valid],
+                               var_xs[valid], var_ys[valid], fall_hrs[valid],
+                               resolution_km, x_steps // 2, y_steps // 2)
+
+    if VERBOSE:
+        log_lines += [f"\n{'='*70}",
+                      "RESULTS - REALISTIC NUKEMAP MATCH",
+                      f"{'='*70}",
+                      f"Max Dose: {np.max(dose_grid):.1f} R/hr",
+                      f"Area >1 R/hr: {np.sum(dose_grid >= 1.0) * resolution_km**2:.0f} km²",
+                      f"Area >10 R/hr: {np.sum(dose_grid >= 10.0) * resolution_km**2:.0f} km²",
+                      f"Area >100 R/hr: {np.sum(dose_grid >= 100.0) * resolution_km**2:.0f} km²",
+                      f"Area >1000 R/hr: {np.sum(dose_grid >= 1000.0) * resolution_km**2:.0f} km²",
+                      "\nCONTOUR DIMENSIONS:"]
+        # Min/max extents per level from the two max-projections; no need
+        # to materialize an (N, 2) argwhere array per contour.
+        col_max = dose_grid.max(axis=0)
+        row_max = dose_grid.max(axis=1)
+        for level in [1000, 100, 10, 1]:
+            cols = np.nonzero(col_max >= level)[0]
+            if cols.size:
+                rows = np.nonzero(row_max >= level)[0]
+                downwind = int(cols[-1] - cols[0])
+                crosswind = int(rows[-1] - rows[0])
+
+                log_lines.append(f"{level:4d} R/hr: {downwind * resolution_km:.1f} × "
+                                 f"{crosswind * resolution_km:.1f} km")
+        log_lines.append(f"{'='*70}\n")
+        sys.stdout.write('\n'.join(log_lines) + '\n')
 
     total_dose_grid = calculate_integrated_dose_grid(dose_grid, arrival_grid, 24.0)
     casualty_data = calculate_fallout_casualties(
@@ -321,8 +494,8 @@ def calculate_delfic_plume(yield_kt, wind_speed_kph, wind_direction_deg,
 
     visualization_wind_angle_deg = (270 - wind_direction_deg) % 360
 
-    x_coords_km = (np.arange(x_steps) - x_steps // 2) * resolution_km
-    y_coords_km = (np.arange(y_steps) - y_steps // 2) * resolution_km
+    x_coords_km = _grid_coords_km(x_steps, resolution_km)
+    y_coords_km = _grid_coords_km(y_steps, resolution_km)
 
     return {
         'dose_grid': dose_grid,
@@ -343,6 +516,51 @@ def calculate_delfic_plume(yield_kt, wind_speed_kph, wind_direction_deg,
         }
     }
 
+def calculate_contour_extents(dose_grid, resolution_km, thresholds):
+    """Downwind length and crosswind width of each dose-rate contour.
+
+    Digitizes the grid once and gets every band's bounding box from a
+    single scipy.ndimage.find_objects call; the extent of cells >= a
+    threshold is then the union of the boxes of that band and all hotter
+    ones, accumulated from the top down. Replaces a per-threshold
+    mask/argwhere pass over the full grid.
+
+    Returns {threshold: (max_downwind_km, full_width_km)} with None for
+    thresholds no cell reaches. Downwind distance is measured from the
+    grid's center column (ground zero).
+    """
+    from scipy import ndimage
+
+    center_x = dose_grid.shape[1] // 2
+    thr_sorted = np.sort(np.asarray(thresholds, dtype=float))
+
+    labels = np.digitize(dose_grid, thr_sorted)
+    slices = ndimage.find_objects(labels)
+
+    extents = {}
+    rmin = rmax = cmin = cmax = None
+    for i in range(len(thr_sorted) - 1, -1, -1):
+        band = slices[i] if i < len(slices) else None
+        if band is not None:
+            rows, cols = band
+            if rmin is None:
+                rmin, rmax = rows.start, rows.stop - 1
+                cmin, cmax = cols.start, cols.stop - 1
+            else:
+                rmin = min(rmin, rows.start)
+                rmax = max(rmax, rows.stop - 1)
+                cmin = min(cmin, cols.start)
+                cmax = max(cmax, cols.stop - 1)
+
+        if rmin is None:
+            extents[float(thr_sorted[i])] = None
+        else:
+            max_downwind_km = max(0, cmax - center_x) * resolution_km
+            full_width_km = (rmax - rmin) * resolution_km
+            extents[float(thr_sorted[i])] = (max_downwind_km, full_width_km)
+
+    return extents
+
 def calculate_integrated_dose(dose_grid_h1, arrival_time_hours, exposure_duration_hours):
     t_start = max(0.1, arrival_time_hours)
     t_end = t_start + exposure_duration_hours
@@ -351,13 +569,18 @@ def calculate_integrated_dose(dose_grid_h1, arrival_time_hours, exposure_duratio
 
 def calculate_integrated_dose_grid(dose_grid_h1, arrival_grid, exposure_duration_hours=24.0):
     """24h exposure for realistic doses"""
-    t_start_grid = np.maximum(0.1, arrival_grid)
-    t_end_grid = t_start_grid + exposure_duration_hours
-    integral_factor = 5 * (np.power(t_start_grid, -0.2) - np.power(t_end_grid, -0.2))
-    total_dose_grid = dose_grid_h1 * integral_factor
-    total_dose_grid[dose_grid_h1 < 1e-6] = 0
-    total_dose_grid[~np.isfinite(arrival_grid)] = 0
-    return total_dose_grid
+    dtype = dose_grid_h1.dtype
+    # One pass over the grid: build the integral factor in-place in a single
+    # scratch array, then fold both masks into the final where().
+    scratch = np.maximum(dtype.type(0.1), arrival_grid)
+    t_end_pow = np.power(scratch + dtype.type(exposure_duration_hours),
+                         dtype.type(-0.2))
+    np.power(scratch, dtype.type(-0.2), out=scratch)
+    np.subtract(scratch, t_end_pow, out=scratch)
+    np.multiply(scratch, dtype.type(5.0), out=scratch)
+    np.multiply(scratch, dose_grid_h1, out=scratch)
+    return np.where(np.isfinite(arrival_grid) & (dose_grid_h1 >= dtype.type(1e-6)),
+                    scratch, dtype.type(0.0))
 
 def calculate_fallout_casualties(total_dose_grid, resolution_km, 
                                  population_density, yield_kt=None):
@@ -387,22 +610,30 @@ def calculate_fallout_casualties(total_dose_grid, resolution_km,
 
     Y_MT = yield_kt / 1000.0
 
+    y033 = Y_MT ** 0.33
+
     fireball_radius = 0.44 * (Y_MT ** 0.4)
-    psi_20_radius = 1.3 * (Y_MT ** 0.33)
-    psi_5_radius = 4.5 * (Y_MT ** 0.33)
-    psi_2_radius = 8.0 * (Y_MT ** 0.33)
-    psi_1_radius = 13.0 * (Y_MT ** 0.33)
+    psi_20_radius = 1.3 * y033
+    psi_5_radius = 4.5 * y033
+    psi_2_radius = 8.0 * y033
+    psi_1_radius = 13.0 * y033
 
     thermal_radius = 0.9 * (Y_MT ** 0.41)
     radiation_radius = 0.65 * (Y_MT ** 0.19)
 
-    area_fireball = math.pi * (fireball_radius ** 2)
-    area_20_psi = math.pi * (psi_20_radius ** 2) - area_fireball
-    area_5_psi = math.pi * (psi_5_radius ** 2) - math.pi * (psi_20_radius ** 2)
-    area_2_psi = math.pi * (psi_2_radius ** 2) - math.pi * (psi_5_radius ** 2)
-    area_1_psi = math.pi * (psi_1_radius ** 2) - math.pi * (psi_2_radius ** 2)
-    area_thermal = math.pi * (thermal_radius ** 2)
-    area_radiation = math.pi * (radiation_radius ** 2)
+    disc_fireball = math.pi * fireball_radius * fireball_radius
+    disc_20_psi = math.pi * psi_20_radius * psi_20_radius
+    disc_5_psi = math.pi * psi_5_radius * psi_5_radius
+    disc_2_psi = math.pi * psi_2_radius * psi_2_radius
+    disc_1_psi = math.pi * psi_1_radius * psi_1_radius
+
+    area_fireball = disc_fireball
+    area_20_psi = disc_20_psi - disc_fireball
+    area_5_psi = disc_5_psi - disc_20_psi
+    area_2_psi = disc_2_psi - disc_5_psi
+    area_1_psi = disc_1_psi - disc_2_psi
+    area_thermal = math.pi * thermal_radius * thermal_radius
+    area_radiation = math.pi * radiation_radius * radiation_radius
 
     pop_fireball = area_fireball * effective_density
     pop_20_psi = area_20_psi * effective_density
@@ -425,13 +656,13 @@ def calculate_fallout_casualties(total_dose_grid, resolution_km,
     fatalities_1_psi = pop_1_psi * 0.03
     injuries_1_psi = pop_1_psi * 0.45
 
-    thermal_only_area = max(0, area_thermal - math.pi * (psi_1_radius ** 2))
+    thermal_only_area = max(0, area_thermal - disc_1_psi)
     thermal_only_pop = thermal_only_area * effective_density
 
     thermal_fatalities = thermal_only_pop * 0.40
     thermal_injuries = thermal_only_pop * 0.55
 
-    radiation_only_area = max(0, area_radiation - math.pi * (psi_1_radius ** 2))
+    radiation_only_area = max(0, area_radiation - disc_1_psi)
     radiation_only_pop = radiation_only_area * effective_density
 
     radiation_fatalities = radiation_only_pop * 0.45
@@ -446,40 +677,23 @@ def calculate_fallout_casualties(total_dose_grid, resolution_km,
     wseg_base_fatalities = total_blast_fatalities + thermal_fatalities + radiation_fatalities
     wseg_base_injuries = total_blast_injuries + thermal_injuries + radiation_injuries
 
-    fallout_fatal = fallout_severe = fallout_moderate = fallout_mild = 0
-    affected_area = 0
-
-    for i in range(total_dose_grid.shape[0]):
-        for j in range(total_dose_grid.shape[1]):
-            dose_rem = total_dose_grid[i, j]
-            if dose_rem < 100:
-                continue
-
-            affected_area += area_per_cell
-            population = population_density * area_per_cell
-
-            if dose_rem >= 900:
-                fallout_fatal += population * 0.85
-                fallout_severe += population * 0.15
-            elif dose_rem >= 700:
-                fallout_fatal += population * 0.45
-                fallout_severe += population * 0.55
-            elif dose_rem >= 500:
-                fallout_fatal += population * 0.15
-                fallout_severe += population * 0.75
-                fallout_moderate += population * 0.10
-            elif dose_rem >= 350:
-                fallout_severe += population * 0.30
-                fallout_moderate += population * 0.70
-            elif dose_rem >= 250:
-                fallout_severe += population * 0.10
-                fallout_moderate += population * 0.90
-            elif dose_rem >= 150:
-                fallout_moderate += population * 0.30
-                fallout_mild += population * 0.70
-            else:  # 100-150 rem
-                fallout_moderate += population * 0.05
-                fallout_mild += population * 0.95
+    # Per-cell severity rates for dose bands <100, 100-150, 150-250, 250-350,
+    # 350-500, 500-700, 700-900 and >=900 rem (same ladder as the old loop).
+    dose_edges = np.array([100, 150, 250, 350, 500, 700, 900])
+    fatal_rates = np.array([0, 0, 0, 0, 0, 0.15, 0.45, 0.85])
+    severe_rates = np.array([0, 0, 0, 0.10, 0.30, 0.75, 0.55, 0.15])
+    moderate_rates = np.array([0, 0.05, 0.30, 0.90, 0.70, 0.10, 0, 0])
+    mild_rates = np.array([0, 0.95, 0.70, 0, 0, 0, 0, 0])
+
+    population = population_density * area_per_cell
+    band_counts = np.bincount(np.digitize(total_dose_grid, dose_edges).ravel(),
+                              minlength=len(dose_edges) + 1)
+
+    fallout_fatal = (band_counts * fatal_rates).sum() * population
+    fallout_severe = (band_counts * severe_rates).sum() * population
+    fallout_moderate = (band_counts * moderate_rates).sum() * population
+    fallout_mild = (band_counts * mild_rates).sum() * population
+    affected_area = band_counts[1:].sum() * area_per_cell
 
     np.random.seed(int(yield_kt * 1337) % 2**32)
 
@@ -34,6 +34,19 @@ DELHI_LOCATIONS = {
     'delhi university': (28.7508153, 77.1162765),
 }
 
+import numpy as np
+
+# Structure-of-arrays view of the dict: with only a few dozen entries, a
+# brute-force argmin over two flat arrays beats a KD-tree query.
+_NAMES = list(DELHI_LOCATIONS)
+_LATS = np.array([DELHI_LOCATIONS[name][0] for name in _NAMES])
+_LONS = np.array([DELHI_LOCATIONS[name][1] for name in _NAMES])
+
 def get_coordinates(place_name):
     """Returns the coordinates for a given place name."""
     return DELHI_LOCATIONS.get(place_name.lower())
+
+def nearest(lat, lon):
+    """Returns the name of the location closest to (lat, lon)."""
+    d2 = (_LATS - lat)**2 + (_LONS - lon)**2
+    return _NAMES[d2.argmin()]
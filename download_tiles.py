@@ -1,21 +1,199 @@
 import os
-import requests
-from math import log, tan, pi, radians, floor, cos
-import time
+import asyncio
+import aiohttp
+import hashlib
+import json
+import sqlite3
+import itertools
+import numpy as np
+from collections import Counter
+from tqdm import tqdm
+from math import asinh, tan, pi, radians
 import random
 
-def sec(x):
-    return 1 / cos(x)
+_HASH_INDEX_NAME = '.hash_index.json'
+_VERIFIED_MANIFEST_NAME = '.verified'
+_PNG_MAGIC = b'\x89PNG\r\n\x1a\n'
+
+# Download-path validation trusts the response headers; the PNG signature
+# is only spot-checked on a sample of bodies (see _download_tile).
+_magic_sample = itertools.count()
+
+def _verify_tile(path):
+    """Check the PNG signature with a single pread, skipping buffered I/O."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return False
+    try:
+        return os.pread(fd, 8, 0) == _PNG_MAGIC
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+
+def _load_verified(tile_path):
+    """Load the set of tile paths whose PNG header was already checked."""
+    try:
+        with open(os.path.join(tile_path, _VERIFIED_MANIFEST_NAME)) as f:
+            return set(f.read().split())
+    except OSError:
+        return set()
+
+def _append_verified(tile_path, paths):
+    if not paths:
+        return
+    try:
+        with open(os.path.join(tile_path, _VERIFIED_MANIFEST_NAME), 'a') as f:
+            f.write('\n'.join(paths) + '\n')
+    except OSError:
+        pass
+
+def _load_hash_index(tile_path):
+    """Load the persistent digest -> canonical tile path map."""
+    try:
+        with open(os.path.join(tile_path, _HASH_INDEX_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_hash_index(tile_path, hash_index):
+    try:
+        with open(os.path.join(tile_path, _HASH_INDEX_NAME), 'w') as f:
+            json.dump(hash_index, f)
+    except OSError:
+        pass
 
 def lat_lon_to_tile(lat, lon, zoom):
     """Convert latitude/longitude to tile coordinates - FIXED VERSION"""
     lat_rad = radians(lat)
     n = 2.0 ** zoom
     x = int((lon + 180.0) / 360.0 * n)
-    y = int((1.0 - log(tan(lat_rad) + (1 / cos(lat_rad))) / pi) / 2.0 * n)
+    # log(tan + sec) == asinh(tan): one less transcendental and no
+    # cancellation near the poles.
+    y = int((1.0 - asinh(tan(lat_rad)) / pi) / 2.0 * n)
     return x, y
 
-def download_delhi_tiles_fixed():
+class TokenBucket:
+    """Adaptive async token bucket shared by all requests to one server.
+
+    Paces requests at a steady rate instead of sleeping a random amount per
+    request, backs off only when the server actually pushes back (429/503)
+    and slowly recovers toward the configured rate on success.
+    """
+
+    def __init__(self, rate_per_s=4.0, burst=8):
+        self._min_period = 1.0 / rate_per_s
+        self._max_period = self._min_period * 32
+        self._period = self._min_period
+        self._burst = burst
+        self._next_time = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            if self._next_time is None:
+                self._next_time = now
+            # Idle time earns back up to `burst` immediate tokens.
+            self._next_time = max(self._next_time, now - self._burst * self._period)
+            wait = self._next_time - now
+            self._next_time += self._period
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def throttle(self, retry_after=None):
+        """Server pushed back: double the pacing period (capped)."""
+        self._period = min(self._period * 2, self._max_period)
+        if retry_after is not None and self._next_time is not None:
+            now = asyncio.get_running_loop().time()
+            self._next_time = max(self._next_time, now + retry_after)
+
+    def relax(self):
+        """Successful response: decay back toward the configured rate."""
+        self._period = max(self._min_period, self._period * 0.95)
+
+def _store_tile(content, tile_file, hash_index):
+    """Write a tile, hardlinking to an identical earlier tile when possible.
+
+    Blank map tiles (ocean, empty outskirts) are byte-identical; linking
+    them to one canonical copy skips the write and saves disk and inodes.
+    """
+    digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+    canonical = hash_index.get(digest)
+    if canonical and canonical != tile_file and os.path.exists(canonical):
+        try:
+            os.link(canonical, tile_file)
+            return digest
+        except OSError:
+            # Cross-device, unsupported FS, or stale target: fall through.
+            pass
+    with open(tile_file, 'wb') as f:
+        f.write(content)
+    hash_index[digest] = tile_file
+    return digest
+
+async def _download_tile(session, sem, tile_servers, buckets, hash_index,
+                         zoom, x, y, tile_file):
+    """Fetch one tile, rotating across servers for failover."""
+    start = hash((x, y)) % len(tile_servers)
+
+    async with sem:
+        for i in range(len(tile_servers)):
+            server = tile_servers[(start + i) % len(tile_servers)]
+            url = server.format(z=zoom, x=x, y=y)
+            bucket = buckets[server]
+
+            for attempt in range(3):
+                await bucket.acquire()
+
+                try:
+                    async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                        if response.status in (429, 503):
+                            retry_after = response.headers.get('Retry-After')
+                            try:
+                                retry_after = float(retry_after)
+                            except (TypeError, ValueError):
+                                retry_after = None
+                            bucket.throttle(retry_after)
+                            await asyncio.sleep(0.5 * 2**attempt * random.uniform(0.5, 1.5))
+                            continue
+
+                        if response.status != 200:
+                            break
+
+                        # The tile servers always set Content-Type and
+                        # Content-Length; checking headers is cheaper than
+                        # inspecting body bytes and skips reading error
+                        # bodies entirely.
+                        if not response.headers.get('Content-Type', '').startswith('image/'):
+                            break
+                        try:
+                            if int(response.headers['Content-Length']) <= 100:
+                                break
+                        except (KeyError, ValueError):
+                            pass  # chunked response: fall back to len(content)
+
+                        content = await response.read()
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    break
+
+                bucket.relax()
+
+                if len(content) > 100:
+                    # Spot-check the PNG signature on every 1000th tile as
+                    # a sanity sample rather than slicing every body.
+                    if next(_magic_sample) % 1000 == 0 and not content.startswith(_PNG_MAGIC):
+                        break
+                    # Tiles are a few KB each; a plain buffered write is
+                    # cheaper than shipping them off to a thread.
+                    digest = _store_tile(content, tile_file, hash_index)
+                    return True, x, y, digest
+                break
+
+    return False, x, y, None
+
+async def _download_delhi_tiles_async():
     """Download Delhi tiles with proper coordinate calculation and deeper zoom."""
 
     delhi_center_lat = 28.6139
@@ -37,21 +215,21 @@ def download_delhi_tiles_fixed():
     zoom_levels = [10, 11, 12, 13, 14, 15, 16, 17]
 
     tile_radius = {
-        10: 3,   
+        10: 3,
 
-        11: 4,   
+        11: 4,
 
-        12: 6,   
+        12: 6,
 
-        13: 8,   
+        13: 8,
 
-        14: 12,  
+        14: 12,
 
-        15: 20,  
+        15: 20,
 
-        16: 35,  
+        16: 35,
 
-        17: 60   
+        17: 60
 
     }
 
@@ -65,87 +243,152 @@ def download_delhi_tiles_fixed():
     print(f"📡 Zoom Levels to Download: {zoom_levels}")
     print()
 
-    for zoom in zoom_levels:
-        print(f"🔍 ZOOM LEVEL {zoom}")
-        print("-" * 30)
-
-        center_x, center_y = lat_lon_to_tile(delhi_center_lat, delhi_center_lon, zoom)
-        radius = tile_radius[zoom]
-
-        x_min = center_x - radius
-        x_max = center_x + radius
-        y_min = center_y - radius  
-        y_max = center_y + radius
-
-        max_tile = (2 ** zoom) - 1
-        x_min = max(0, x_min)
-        x_max = min(max_tile, x_max)
-        y_min = max(0, y_min)
-        y_max = min(max_tile, y_max)
-
-        tiles_needed = (x_max - x_min + 1) * (y_max - y_min + 1)
-        print(f"📊 Center tile: {center_x}, {center_y}")
-        print(f"📦 Range: X({x_min}-{x_max}) Y({y_min}-{y_max})")
-        print(f"🎯 Tiles to download: {tiles_needed}")
-
-        zoom_downloaded = 0
-        zoom_attempted = 0
-
-        for x in range(x_min, x_max + 1):
-            for y in range(y_min, y_max + 1):
-                zoom_attempted += 1
-                total_attempted += 1
-
+    # One session for the whole run so TCP/TLS connections are reused across
+    # all tiles; the semaphore keeps us from hammering the servers. Long
+    # keepalive and a DNS cache keep the per-host connections warm across
+    # zoom levels instead of re-handshaking between batches.
+    connector = aiohttp.TCPConnector(limit=16, limit_per_host=8,
+                                     keepalive_timeout=60, ttl_dns_cache=300)
+    sem = asyncio.Semaphore(16)
+    # One bucket per server so each host is rate-limited independently.
+    buckets = {server: TokenBucket() for server in tile_servers}
+    hash_index = _load_hash_index(tile_path)
+    verified = _load_verified(tile_path)
+    newly_verified = []
+
+    async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
+        for zoom in zoom_levels:
+            print(f"🔍 ZOOM LEVEL {zoom}")
+            print("-" * 30)
+
+            center_x, center_y = lat_lon_to_tile(delhi_center_lat, delhi_center_lon, zoom)
+            radius = tile_radius[zoom]
+
+            x_min = center_x - radius
+            x_max = center_x + radius
+            y_min = center_y - radius
+            y_max = center_y + radius
+
+            max_tile = (2 ** zoom) - 1
+            x_min = max(0, x_min)
+            x_max = min(max_tile, x_max)
+            y_min = max(0, y_min)
+            y_max = min(max_tile, y_max)
+
+            tiles_needed = (x_max - x_min + 1) * (y_max - y_min + 1)
+            print(f"📊 Center tile: {center_x}, {center_y}")
+            print(f"📦 Range: X({x_min}-{x_max}) Y({y_min}-{y_max})")
+            print(f"🎯 Tiles to download: {tiles_needed}")
+
+            zoom_downloaded = 0
+            zoom_attempted = tiles_needed
+            total_attempted += tiles_needed
+
+            xs = np.arange(x_min, x_max + 1)
+            ys = np.arange(y_min, y_max + 1)
+            tile_names = [f"{y}.png" for y in ys.tolist()]
+
+            pending = []
+            for x in xs.tolist():
                 tile_dir = os.path.join(tile_path, str(zoom), str(x))
-                tile_file = os.path.join(tile_dir, f"{y}.png")
 
-                if os.path.exists(tile_file):
-                    try:
-                        with open(tile_file, 'rb') as f:
-                            if f.read(4) == b'\x89PNG':
-                                continue
-                    except:
-                        pass
+                # One listdir per x-column replaces a stat() per tile;
+                # only files actually present get the PNG magic check.
+                try:
+                    existing = set(os.listdir(tile_dir))
+                except FileNotFoundError:
+                    existing = set()
 
+                # One makedirs per x-column, not one per tile: every tile in
+                # this inner loop lands in the same directory.
                 os.makedirs(tile_dir, exist_ok=True)
 
-                success = False
-                for server in tile_servers:
-                    if success:
-                        break
-
-                    url = server.format(z=zoom, x=x, y=y)
+                for y, name in zip(ys.tolist(), tile_names):
+                    tile_file = os.path.join(tile_dir, name)
+
+                    if name in existing:
+                        # Manifest hit: header was checked on an earlier run.
+                        if tile_file in verified:
+                            continue
+                        # Otherwise a cheap size probe, with the full magic
+                        # check paid once per file, recorded in the manifest.
+                        try:
+                            if os.stat(tile_file).st_size >= 100 and _verify_tile(tile_file):
+                                newly_verified.append(tile_file)
+                                continue
+                        except OSError:
+                            pass
+
+                    r2 = (x - center_x) ** 2 + (y - center_y) ** 2
+                    pending.append((x, y, tile_file, r2))
+
+            def make_tasks(items):
+                return [asyncio.ensure_future(
+                    _download_tile(session, sem, tile_servers, buckets, hash_index,
+                                   zoom, x, y, tile_file))
+                        for x, y, tile_file, _ in items]
+
+            # tqdm throttles its own refreshes, so progress costs next to
+            # nothing compared to a print per tile.
+            pbar = tqdm(total=len(pending), unit='tile', smoothing=0.1,
+                        desc=f"zoom {zoom}")
+            zoom_failed = 0
+
+            async def run_batch(batch_tasks):
+                nonlocal zoom_downloaded, total_downloaded, zoom_failed
+                digests = Counter()
+                for future in asyncio.as_completed(batch_tasks):
+                    success, x, y, digest = await future
 
+                    if success:
+                        zoom_downloaded += 1
+                        total_downloaded += 1
+                        newly_verified.append(
+                            os.path.join(tile_path, str(zoom), str(x), f"{y}.png"))
+                        digests[digest] += 1
+                    else:
+                        zoom_failed += 1
+                        tqdm.write(f"  ❌ Failed: {zoom}/{x}/{y}")
+
+                    pbar.update(1)
+                    pbar.set_postfix(ok=zoom_downloaded, fail=zoom_failed)
+                return digests
+
+            # Probe a few outer-ring tiles first; if several come back
+            # byte-identical, the outskirts render blank at this zoom and
+            # the rest of the ring can be hardlinked without any network.
+            outer_r2 = (radius * 0.8) ** 2
+            outer = [t for t in pending if t[3] > outer_r2]
+            inner = [t for t in pending if t[3] <= outer_r2]
+            probe, outer = outer[:20], outer[20:]
+
+            probe_digests = await run_batch(make_tasks(probe))
+            blank_digest = next((d for d, c in probe_digests.items() if d and c >= 3), None)
+
+            blank_path = hash_index.get(blank_digest)
+            if blank_path and os.path.exists(blank_path):
+                still_needed = []
+                for x, y, tile_file, r2 in outer:
                     try:
-                        time.sleep(random.uniform(0.1, 0.4))
-
-                        response = requests.get(url, headers=headers, timeout=10)
-
-                        if response.status_code == 200:
-                            content = response.content
-                            if len(content) > 100 and content.startswith(b'\x89PNG'):
-                                with open(tile_file, 'wb') as f:
-                                    f.write(content)
-
-                                zoom_downloaded += 1
-                                total_downloaded += 1
-                                success = True
-
-                                if total_downloaded % 20 == 0:
-                                    progress = (zoom_attempted / tiles_needed) * 100
-                                    print(f"  📥 {zoom_downloaded}/{tiles_needed} ({progress:.1f}%) - Total: {total_downloaded}")
-
-                                break
-
-                    except:
+                        os.link(blank_path, tile_file)
+                    except OSError:
+                        still_needed.append((x, y, tile_file, r2))
                         continue
+                    zoom_downloaded += 1
+                    total_downloaded += 1
+                    newly_verified.append(tile_file)
+                    pbar.update(1)
+                outer = still_needed
+
+            await run_batch(make_tasks(inner + outer))
+            pbar.close()
 
-                if not success:
-                    print(f"  ❌ Failed: {zoom}/{x}/{y}")
+            success_rate = (zoom_downloaded / tiles_needed) * 100 if tiles_needed > 0 else 0
+            print(f"✅ Zoom {zoom} Complete: {zoom_downloaded}/{tiles_needed} tiles ({success_rate:.1f}%)")
+            print()
 
-        success_rate = (zoom_downloaded / tiles_needed) * 100 if tiles_needed > 0 else 0
-        print(f"✅ Zoom {zoom} Complete: {zoom_downloaded}/{tiles_needed} tiles ({success_rate:.1f}%)")
-        print()
+    _save_hash_index(tile_path, hash_index)
+    _append_verified(tile_path, newly_verified)
 
     print("🎉 DOWNLOAD COMPLETE!")
     print("=" * 40)
@@ -160,6 +403,71 @@ def download_delhi_tiles_fixed():
 
     return total_downloaded
 
+def pack_tiles_to_mbtiles(tile_path='assets/tiles', mbtiles_path='assets/delhi.mbtiles'):
+    """Pack the downloaded tile tree into a single MBTiles SQLite container.
+
+    50k loose PNGs cost 50k inodes and an open/close per read; an .mbtiles
+    DB holds them all in one file with much better read locality and is the
+    standard distribution format. Uses the spec's deduplicated layout — a
+    map(z,x,y) -> tile_id table over an images(tile_id, blob) table with a
+    `tiles` view on top — so byte-identical blank tiles share one blob,
+    mirroring the hardlink dedup of the download path.
+    """
+    conn = sqlite3.connect(mbtiles_path)
+    try:
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS metadata (name TEXT, value TEXT);
+            CREATE TABLE IF NOT EXISTS images (tile_id TEXT PRIMARY KEY, tile_data BLOB);
+            CREATE TABLE IF NOT EXISTS map (
+                zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER,
+                tile_id TEXT,
+                PRIMARY KEY (zoom_level, tile_column, tile_row));
+            CREATE VIEW IF NOT EXISTS tiles AS
+                SELECT map.zoom_level, map.tile_column, map.tile_row, images.tile_data
+                FROM map JOIN images ON map.tile_id = images.tile_id;
+        """)
+        conn.executemany(
+            'INSERT OR REPLACE INTO metadata VALUES (?, ?)',
+            [('name', 'Delhi'), ('format', 'png'), ('type', 'baselayer'),
+             ('version', '1'), ('description', 'Delhi offline tiles')])
+
+        packed = 0
+        for zoom_name in sorted(os.listdir(tile_path)):
+            if not zoom_name.isdigit():
+                continue
+            zoom = int(zoom_name)
+            zoom_dir = os.path.join(tile_path, zoom_name)
+            max_y = (2 ** zoom) - 1
+            for x_name in sorted(os.listdir(zoom_dir)):
+                if not x_name.isdigit():
+                    continue
+                x_dir = os.path.join(zoom_dir, x_name)
+                for tile_name in os.listdir(x_dir):
+                    if not tile_name.endswith('.png'):
+                        continue
+                    with open(os.path.join(x_dir, tile_name), 'rb') as f:
+                        content = f.read()
+                    tile_id = hashlib.blake2b(content, digest_size=16).hexdigest()
+                    # MBTiles rows are TMS (south-up), hence the y flip.
+                    row = max_y - int(tile_name[:-4])
+                    conn.execute('INSERT OR IGNORE INTO images VALUES (?, ?)',
+                                 (tile_id, content))
+                    conn.execute('INSERT OR REPLACE INTO map VALUES (?, ?, ?, ?)',
+                                 (zoom, int(x_name), row, tile_id))
+                    packed += 1
+                    if packed % 500 == 0:
+                        conn.commit()
+        conn.commit()
+    finally:
+        conn.close()
+    return packed
+
+def download_delhi_tiles_fixed():
+    """Synchronous entry point kept for existing callers."""
+    return asyncio.run(_download_delhi_tiles_async())
+
 if __name__== '__main__':
     print("Starting Delhi tile download...")
     try:
@@ -172,4 +480,4 @@ if __name__== '__main__':
         print("\n⏹ Download stopped by user.")
     except Exception as e:
         print(f"\n💥 Error: {e}")
-        print("🔧 Try running the script again.")
\ No newline at end of file
+        print("🔧 Try running the script again.")
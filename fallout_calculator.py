@@ -1,6 +1,13 @@
 import math
+from functools import lru_cache
 import numpy as np
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 def calculate_initial_dose_rate(yield_kt):
 
     if yield_kt <= 0:
@@ -12,55 +19,124 @@ def calculate_initial_dose_rate(yield_kt):
 
     return initial_dose_rate
 
+# The calculators below are pure functions of yield (and a small enum), so
+# GUI redraws hitting the same weapon repeatedly get cached tuples and only
+# pay for building the result dict. Tuples keep the cached values immutable.
+
+# Coefficients/exponents of calculate_blast_radii, in key order, so a whole
+# batch of yields goes through a single np.power call.
+_BLAST_KEYS = ['fireball_km', 'burns_3rd_degree_km', 'blast_20_psi_km',
+               'blast_5_psi_km', 'blast_2_psi_km', 'radiation_500_rem_km',
+               'radiation_100_rem_km', 'emp_km']
+_BLAST_COEFS = np.array([0.09, 0.8, 0.28, 0.54, 0.91, 0.65, 1.15, 2.4])
+_BLAST_EXPS = np.array([0.40, 0.41, 0.33, 0.40, 0.33, 0.19, 0.19, 0.25])
+
+# Every non-branching power law used by calculate_comprehensive_effects:
+# the eight blast radii, cloud height/width, and the surface-crater
+# diameter/depth. One np.power evaluates them all.
+_EFFECTS_COEFS = np.concatenate([_BLAST_COEFS, [12.0, 2.0, 140.0, 24.0]])
+_EFFECTS_EXPS = np.concatenate([_BLAST_EXPS, [0.2, 0.25, 0.3, 0.3]])
+
+@lru_cache(maxsize=256)
+def _effects_power_laws(yield_kt):
+    """All yield-only power laws for one yield, fused into one np.power."""
+    Y_MT = yield_kt / 1000.0
+    return tuple((_EFFECTS_COEFS * np.power(Y_MT, _EFFECTS_EXPS)).tolist())
+
+def _blast_radii_njit(Y_MT):
+    """Blast radii as a length-8 array in _BLAST_KEYS order.
+
+    JIT-compiled hot path for callers that evaluate radii per grid cell in
+    a simulation loop: index the array directly and skip the dict. The
+    cached dict path below stays on the fused np.power.
+    """
+    out = np.empty(8)
+    out[0] = 0.09 * Y_MT ** 0.40
+    out[1] = 0.8 * Y_MT ** 0.41
+    out[2] = 0.28 * Y_MT ** 0.33
+    out[3] = 0.54 * Y_MT ** 0.40
+    out[4] = 0.91 * Y_MT ** 0.33
+    out[5] = 0.65 * Y_MT ** 0.19
+    out[6] = 1.15 * Y_MT ** 0.19
+    out[7] = 2.4 * Y_MT ** 0.25
+    return out
+
+if NUMBA_AVAILABLE:
+    _blast_radii_njit = njit(cache=True, fastmath=True)(_blast_radii_njit)
+
 def calculate_blast_radii(yield_kt):
 
     if yield_kt <= 0:
         return {}
 
-    Y_MT = yield_kt / 1000.0  
-
-    radii = {}
-
-    radii['fireball_km'] = 0.09 * (Y_MT ** 0.4)
-
-    radii['burns_3rd_degree_km'] = 0.8 * (Y_MT ** 0.41)
-
-    radii['blast_20_psi_km'] = 0.28 * (Y_MT ** 0.33)  
+    return dict(zip(_BLAST_KEYS, _effects_power_laws(float(yield_kt))))
+
+def calculate_blast_radii_vec(yield_kt):
+    """Vectorized calculate_blast_radii for an array of yields.
+
+    Returns a dict of arrays keyed like the scalar version; non-positive
+    yields produce zero radii. Intended for sweeps/Monte Carlo batches
+    where per-call Python overhead would dominate.
+    """
+    Y_MT = np.asarray(yield_kt, dtype=float) / 1000.0
+    with np.errstate(invalid='ignore'):
+        radii_mat = _BLAST_COEFS * np.power(Y_MT[..., None], _BLAST_EXPS)
+    radii_mat = np.where(Y_MT[..., None] > 0, radii_mat, 0.0)
+    return {key: radii_mat[..., i] for i, key in enumerate(_BLAST_KEYS)}
+
+_CASUALTY_FATALITY_WEIGHTS = np.array([0.90, 0.50, 0.05])
+_CASUALTY_INJURY_WEIGHTS = np.array([0.09, 0.40, 0.25])
+
+def estimate_casualties_vec(yield_kt, population_density=1000):
+    """Vectorized estimate_casualties for an array of yields.
+
+    Zone areas come from annular differences pi*(r_i^2 - r_{i-1}^2) and the
+    fatality/injury sums are one matmul against the weight vectors.
+    """
+    radii = calculate_blast_radii_vec(yield_kt)
+    r2 = np.stack([radii['blast_20_psi_km'], radii['blast_5_psi_km'],
+                   radii['blast_2_psi_km']], axis=-1) ** 2
+    areas = np.pi * np.diff(r2, axis=-1, prepend=0.0)
+    pops = areas * population_density
+
+    return {
+        'severe_zone_km2': areas[..., 0],
+        'moderate_zone_km2': areas[..., 1],
+        'light_zone_km2': areas[..., 2],
+        'severe_pop': pops[..., 0],
+        'moderate_pop': pops[..., 1],
+        'light_pop': pops[..., 2],
+        'estimated_fatalities': pops @ _CASUALTY_FATALITY_WEIGHTS,
+        'estimated_injuries': pops @ _CASUALTY_INJURY_WEIGHTS,
+        'total_affected': pops.sum(axis=-1),
+    }
 
-    radii['blast_5_psi_km'] = 0.54 * (Y_MT ** 0.40)   
+@lru_cache(maxsize=256)
+def _crater_cached(yield_kt, burst_type):
+    Y_MT = yield_kt / 1000.0
 
-    radii['blast_2_psi_km'] = 0.91 * (Y_MT ** 0.33)   
+    if burst_type == 'surface':
 
-    radii['radiation_500_rem_km'] = 0.65 * (Y_MT ** 0.19)  
+        diameter_m, depth_m = _effects_power_laws(yield_kt)[10:12]
+    else:  # subsurface
 
-    radii['radiation_100_rem_km'] = 1.15 * (Y_MT ** 0.19)  
+        diameter_m = 120 * (Y_MT ** 0.25)
+        depth_m = 35 * (Y_MT ** 0.3)
 
-    radii['emp_km'] = 2.4 * (Y_MT ** 0.25)
+    radius_m = diameter_m / 2
+    volume_m3 = (math.pi / 3) * (radius_m ** 2) * depth_m
 
-    return radii
+    return diameter_m, depth_m, radius_m, volume_m3
 
 def calculate_crater_dimensions(yield_kt, burst_type='surface'):
 
     if yield_kt <= 0:
         return {}
 
-    Y_MT = yield_kt / 1000.0
+    diameter_m, depth_m, radius_m, volume_m3 = _crater_cached(float(yield_kt), burst_type)
 
-    crater = {}
-
-    if burst_type == 'surface':
-
-        crater['diameter_m'] = 140 * (Y_MT ** 0.3)
-        crater['depth_m'] = 24 * (Y_MT ** 0.3)
-    else:  # subsurface
-
-        crater['diameter_m'] = 120 * (Y_MT ** 0.25)
-        crater['depth_m'] = 35 * (Y_MT ** 0.3)
-
-    crater['radius_m'] = crater['diameter_m'] / 2
-    crater['volume_m3'] = (math.pi / 3) * (crater['radius_m'] ** 2) * crater['depth_m']
-
-    return crater
+    return {'diameter_m': diameter_m, 'depth_m': depth_m,
+            'radius_m': radius_m, 'volume_m3': volume_m3}
 
 def estimate_casualties(yield_kt, population_density=1000):
 
@@ -71,96 +147,86 @@ def estimate_casualties(yield_kt, population_density=1000):
 
     casualties = {}
 
-    area_20_psi = math.pi * (radii['blast_20_psi_km'] ** 2)
-    area_5_psi = math.pi * (radii['blast_5_psi_km'] ** 2)
-    area_2_psi = math.pi * (radii['blast_2_psi_km'] ** 2)
-
-    casualties['severe_zone_km2'] = area_20_psi
-    casualties['moderate_zone_km2'] = area_5_psi - area_20_psi
-    casualties['light_zone_km2'] = area_2_psi - area_5_psi
-
-    casualties['severe_pop'] = int(area_20_psi * population_density)
-    casualties['moderate_pop'] = int((area_5_psi - area_20_psi) * population_density)
-    casualties['light_pop'] = int((area_2_psi - area_5_psi) * population_density)
-
-    casualties['estimated_fatalities'] = int(
-        casualties['severe_pop'] * 0.90 +      
-
-        casualties['moderate_pop'] * 0.50 +    
+    # Zone areas as annular differences pi*(r_i^2 - r_{i-1}^2) in one
+    # vectorized step, instead of three full-disk areas subtracted pairwise
+    # (which cancels near-equal large values).
+    r = np.array([radii['blast_20_psi_km'], radii['blast_5_psi_km'],
+                  radii['blast_2_psi_km']])
+    areas = np.pi * np.diff(r * r, prepend=0.0)
+    pops = (areas * population_density).astype(int)
 
-        casualties['light_pop'] * 0.05         
+    casualties['severe_zone_km2'] = float(areas[0])
+    casualties['moderate_zone_km2'] = float(areas[1])
+    casualties['light_zone_km2'] = float(areas[2])
 
-    )
+    casualties['severe_pop'] = int(pops[0])
+    casualties['moderate_pop'] = int(pops[1])
+    casualties['light_pop'] = int(pops[2])
 
-    casualties['estimated_injuries'] = int(
-        casualties['severe_pop'] * 0.09 +      
+    casualties['estimated_fatalities'] = int(pops @ _CASUALTY_FATALITY_WEIGHTS)
+    casualties['estimated_injuries'] = int(pops @ _CASUALTY_INJURY_WEIGHTS)
+    casualties['total_affected'] = int(pops.sum())
 
-        casualties['moderate_pop'] * 0.40 +    
-
-        casualties['light_pop'] * 0.25         
+    return casualties
 
-    )
+@lru_cache(maxsize=256)
+def _cloud_cached(yield_kt):
+    height_km, width_km = _effects_power_laws(yield_kt)[8:10]
 
-    casualties['total_affected'] = (casualties['severe_pop'] + 
-                                   casualties['moderate_pop'] + 
-                                   casualties['light_pop'])
+    stem_height_km = 0.3 * height_km
 
-    return casualties
+    return height_km, width_km, stem_height_km
 
 def calculate_mushroom_cloud_height(yield_kt):
 
     if yield_kt <= 0:
         return {}
 
-    Y_MT = yield_kt / 1000.0
-
-    cloud = {}
-
-    cloud['height_km'] = 12.0 * (Y_MT ** 0.2)  
+    height_km, width_km, stem_height_km = _cloud_cached(float(yield_kt))
 
-    cloud['height_m'] = cloud['height_km'] * 1000
+    return {'height_km': height_km, 'height_m': height_km * 1000,
+            'width_km': width_km, 'width_m': width_km * 1000,
+            'stem_height_km': stem_height_km, 'stem_height_m': stem_height_km * 1000}
 
-    cloud['width_km'] = 2.0 * (Y_MT ** 0.25)
-    cloud['width_m'] = cloud['width_km'] * 1000
-
-    cloud['stem_height_km'] = 0.3 * cloud['height_km']
-    cloud['stem_height_m'] = cloud['stem_height_km'] * 1000
-
-    return cloud
-
-def estimate_emp_effects(yield_kt, burst_altitude_km=0):
+@lru_cache(maxsize=256)
+def _emp_cached(yield_kt, burst_altitude_km):
+    Y_MT = yield_kt / 1000.0
 
-    if yield_kt <= 0:
-        return {}
+    if burst_altitude_km < 30:
 
-    Y_MT = yield_kt / 1000.0
+        affected_radius_km = 2.4 * (Y_MT ** 0.25)
+        peak_field_strength = 50000 * (Y_MT ** 0.5)
 
-    emp = {}
+        emp_type = 'Local'
 
-    if burst_altitude_km < 30:  
+    elif burst_altitude_km < 100:
 
-        emp['affected_radius_km'] = 2.4 * (Y_MT ** 0.25)
-        emp['peak_field_strength'] = 50000 * (Y_MT ** 0.5)  
+        affected_radius_km = 50 * (Y_MT ** 0.3)
+        peak_field_strength = 25000 * (Y_MT ** 0.4)
+        emp_type = 'Regional'
 
-        emp['emp_type'] = 'Local'
+    else:  # Very high altitude (HEMP)
 
-    elif burst_altitude_km < 100:  
+        affected_radius_km = 1000 * (Y_MT ** 0.2)
+        peak_field_strength = 10000 * (Y_MT ** 0.3)
+        emp_type = 'Continental'
 
-        emp['affected_radius_km'] = 50 * (Y_MT ** 0.3)
-        emp['peak_field_strength'] = 25000 * (Y_MT ** 0.4)
-        emp['emp_type'] = 'Regional'
+    return affected_radius_km, peak_field_strength, emp_type
 
-    else:  # Very high altitude (HEMP)
+def estimate_emp_effects(yield_kt, burst_altitude_km=0):
 
-        emp['affected_radius_km'] = 1000 * (Y_MT ** 0.2)
-        emp['peak_field_strength'] = 10000 * (Y_MT ** 0.3)
-        emp['emp_type'] = 'Continental'
+    if yield_kt <= 0:
+        return {}
 
-    emp['burst_altitude_km'] = burst_altitude_km
-    emp['electronics_damage_radius_km'] = emp['affected_radius_km'] * 0.7
-    emp['power_grid_damage_radius_km'] = emp['affected_radius_km'] * 0.9
+    affected_radius_km, peak_field_strength, emp_type = _emp_cached(
+        float(yield_kt), float(burst_altitude_km))
 
-    return emp
+    return {'affected_radius_km': affected_radius_km,
+            'peak_field_strength': peak_field_strength,
+            'emp_type': emp_type,
+            'burst_altitude_km': burst_altitude_km,
+            'electronics_damage_radius_km': affected_radius_km * 0.7,
+            'power_grid_damage_radius_km': affected_radius_km * 0.9}
 
 def calculate_comprehensive_effects(yield_kt, burst_altitude_km=0, population_density=1000):
 
@@ -187,6 +253,17 @@ def calculate_comprehensive_effects(yield_kt, burst_altitude_km=0, population_de
 
     return effects
 
+# Warm the power-law caches for the canonical weapon yields at import so
+# the first GUI query never pays for the exponentials; other yields fill
+# the caches on first use as usual.
+_CANONICAL_YIELDS_KT = (1, 5, 15, 50, 100, 150, 500, 1000, 5000, 10000)
+
+for _y in _CANONICAL_YIELDS_KT:
+    _effects_power_laws(float(_y))
+    _crater_cached(float(_y), 'surface')
+    _emp_cached(float(_y), 0.0)
+del _y
+
 def create_effects_summary(yield_kt, burst_altitude_km=0, population_density=1000):
 
     effects = calculate_comprehensive_effects(yield_kt, burst_altitude_km, population_density)
@@ -194,65 +271,69 @@ def create_effects_summary(yield_kt, burst_altitude_km=0, population_density=100
     if not effects:
         return "No effects data available."
 
-    summary = f"NUCLEAR WEAPON EFFECTS ANALYSIS\n"
-    summary += f"{'='*40}\n\n"
+    # Collect fragments and join once at the end; repeated str += churns
+    # the allocator with intermediate strings.
+    parts = []
+
+    parts.append(f"NUCLEAR WEAPON EFFECTS ANALYSIS\n")
+    parts.append(f"{'='*40}\n\n")
 
-    summary += f"Weapon Yield: {yield_kt:,.0f} kilotons\n"
-    summary += f"Burst Type: {effects['burst_type'].title()}\n"
+    parts.append(f"Weapon Yield: {yield_kt:,.0f} kilotons\n")
+    parts.append(f"Burst Type: {effects['burst_type'].title()}\n")
     if burst_altitude_km > 0:
-        summary += f"Burst Altitude: {burst_altitude_km:.1f} km\n"
-    summary += f"Population Density: {population_density:,} people/km²\n\n"
+        parts.append(f"Burst Altitude: {burst_altitude_km:.1f} km\n")
+    parts.append(f"Population Density: {population_density:,} people/km²\n\n")
 
     if 'blast_radii' in effects:
         blast = effects['blast_radii']
-        summary += f"BLAST EFFECTS:\n"
-        summary += f"  Complete destruction (20 psi): {blast.get('blast_20_psi_km', 0):.2f} km radius\n"
-        summary += f"  Heavy damage (5 psi): {blast.get('blast_5_psi_km', 0):.2f} km radius\n"
-        summary += f"  Moderate damage (2 psi): {blast.get('blast_2_psi_km', 0):.2f} km radius\n\n"
+        parts.append(f"BLAST EFFECTS:\n")
+        parts.append(f"  Complete destruction (20 psi): {blast.get('blast_20_psi_km', 0):.2f} km radius\n")
+        parts.append(f"  Heavy damage (5 psi): {blast.get('blast_5_psi_km', 0):.2f} km radius\n")
+        parts.append(f"  Moderate damage (2 psi): {blast.get('blast_2_psi_km', 0):.2f} km radius\n\n")
 
     if 'blast_radii' in effects and 'burns_3rd_degree_km' in effects['blast_radii']:
         thermal = effects['blast_radii']['burns_3rd_degree_km']
-        summary += f"THERMAL EFFECTS:\n"
-        summary += f"  3rd degree burns: {thermal:.2f} km radius\n\n"
+        parts.append(f"THERMAL EFFECTS:\n")
+        parts.append(f"  3rd degree burns: {thermal:.2f} km radius\n\n")
 
     if 'blast_radii' in effects:
         blast = effects['blast_radii']
         if 'radiation_500_rem_km' in blast:
-            summary += f"PROMPT RADIATION:\n"
-            summary += f"  Lethal dose (500 rem): {blast['radiation_500_rem_km']:.2f} km radius\n"
-            summary += f"  Severe effects (100 rem): {blast['radiation_100_rem_km']:.2f} km radius\n\n"
+            parts.append(f"PROMPT RADIATION:\n")
+            parts.append(f"  Lethal dose (500 rem): {blast['radiation_500_rem_km']:.2f} km radius\n")
+            parts.append(f"  Severe effects (100 rem): {blast['radiation_100_rem_km']:.2f} km radius\n\n")
 
     if 'casualties' in effects:
         cas = effects['casualties']
-        summary += f"CASUALTY ESTIMATES:\n"
-        summary += f"  Total affected population: {cas.get('total_affected', 0):,}\n"
-        summary += f"  Estimated fatalities: {cas.get('estimated_fatalities', 0):,}\n"
-        summary += f"  Estimated injuries: {cas.get('estimated_injuries', 0):,}\n\n"
+        parts.append(f"CASUALTY ESTIMATES:\n")
+        parts.append(f"  Total affected population: {cas.get('total_affected', 0):,}\n")
+        parts.append(f"  Estimated fatalities: {cas.get('estimated_fatalities', 0):,}\n")
+        parts.append(f"  Estimated injuries: {cas.get('estimated_injuries', 0):,}\n\n")
 
     if 'mushroom_cloud' in effects:
         cloud = effects['mushroom_cloud']
-        summary += f"MUSHROOM CLOUD:\n"
-        summary += f"  Maximum height: {cloud.get('height_km', 0):.1f} km\n"
-        summary += f"  Cloud width: {cloud.get('width_km', 0):.1f} km\n\n"
+        parts.append(f"MUSHROOM CLOUD:\n")
+        parts.append(f"  Maximum height: {cloud.get('height_km', 0):.1f} km\n")
+        parts.append(f"  Cloud width: {cloud.get('width_km', 0):.1f} km\n\n")
 
     if 'emp_effects' in effects:
         emp = effects['emp_effects']
-        summary += f"EMP EFFECTS:\n"
-        summary += f"  Type: {emp.get('emp_type', 'Unknown')}\n"
-        summary += f"  Affected radius: {emp.get('affected_radius_km', 0):.1f} km\n"
-        summary += f"  Electronics damage: {emp.get('electronics_damage_radius_km', 0):.1f} km\n\n"
+        parts.append(f"EMP EFFECTS:\n")
+        parts.append(f"  Type: {emp.get('emp_type', 'Unknown')}\n")
+        parts.append(f"  Affected radius: {emp.get('affected_radius_km', 0):.1f} km\n")
+        parts.append(f"  Electronics damage: {emp.get('electronics_damage_radius_km', 0):.1f} km\n\n")
 
     if 'crater' in effects:
         crater = effects['crater']
-        summary += f"CRATER:\n"
-        summary += f"  Diameter: {crater.get('diameter_m', 0):.0f} meters\n"
-        summary += f"  Depth: {crater.get('depth_m', 0):.0f} meters\n\n"
+        parts.append(f"CRATER:\n")
+        parts.append(f"  Diameter: {crater.get('diameter_m', 0):.0f} meters\n")
+        parts.append(f"  Depth: {crater.get('depth_m', 0):.0f} meters\n\n")
 
     if 'total_destruction_area_km2' in effects:
         area = effects['total_destruction_area_km2']
-        summary += f"TOTAL DESTRUCTION AREA: {area:.1f} km²\n"
+        parts.append(f"TOTAL DESTRUCTION AREA: {area:.1f} km²\n")
 
-    return summary
+    return "".join(parts)
 
 def test_fallout_calculator():
     """Test the enhanced fallout calculator functions."""
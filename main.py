@@ -1,8 +1,9 @@
 import os
 import math
+import bisect
+import threading
 import numpy as np
 import traceback
-from scipy import ndimage
 from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.gridlayout import GridLayout
@@ -13,7 +14,9 @@ from kivy.uix.button import Button
 from kivy.uix.widget import Widget
 from kivy.uix.spinner import Spinner
 from kivy.uix.popup import Popup
-from kivy.graphics import Color, Ellipse, Rotate, PushMatrix, PopMatrix, Translate, Rectangle
+from kivy.graphics import (Color, Ellipse, Rotate, PushMatrix, PopMatrix, Translate,
+                           Rectangle, InstructionGroup, Mesh)
+from kivy.graphics.texture import Texture
 from kivy.core.window import Window
 from kivy.clock import Clock
 
@@ -45,9 +48,10 @@ except ImportError as e:
     DELHI_LOCATIONS = {'connaught place': (28.6315, 77.2167)}
 
 try:
-    from delfic_engine import (calculate_delfic_plume, 
-                              calculate_integrated_dose_grid, 
-                              calculate_fallout_casualties)
+    from delfic_engine import (calculate_delfic_plume,
+                              calculate_integrated_dose_grid,
+                              calculate_fallout_casualties,
+                              calculate_contour_extents)
     DELFIC_AVAILABLE = True
     print("✓ DELFIC backend loaded")
 except ImportError as e:
@@ -55,6 +59,16 @@ except ImportError as e:
 
 from map_widget import OfflineMap
 
+def latlon_to_frame_km(lat, lon, origin_lat_lon, km_per_deg_lon, cos_a, sin_a):
+    """Flat-earth offsets from an origin, rotated into a bearing-aligned frame.
+
+    Shared by both plume click handlers: +x runs along the bearing whose
+    cos/sin are passed in, +y across it. Accurate to <0.1% at plume scales.
+    """
+    east_km = (lon - origin_lat_lon[1]) * km_per_deg_lon
+    north_km = (lat - origin_lat_lon[0]) * 111.32
+    return north_km * cos_a + east_km * sin_a, east_km * cos_a - north_km * sin_a
+
 def wind_to_plume_angle(wind_from_degrees):
     """
     Convert wind direction to plume direction for Kivy rendering.
@@ -101,8 +115,30 @@ POPULATION_DENSITIES = {
     'Custom': 0
 }
 
+# Spinner value lists built once; DoseCalculatorPopup in particular can be
+# opened many times per session and shouldn't rebuild its choices each time.
+_SHIELDING_KEYS = tuple(SHIELDING_FACTORS)
+_DENSITY_KEYS = tuple(POPULATION_DENSITIES)
+_LOCATION_VALUES = tuple(sorted(loc.title() for loc in DELHI_LOCATIONS))
+
 Window.size = (1400, 900)
 
+# Health outcome per shielded-dose band; index found by bisection.
+_DOSE_THRESHOLDS = (50, 200, 400, 600)
+_DOSE_HEALTH_MSGS = (
+    "[color=00ff00]No immediate symptoms[/color]",
+    "[color=ffff00]Mild radiation sickness possible[/color]",
+    "[color=ff8800]Moderate radiation sickness likely[/color]",
+    "[color=ff0000]Severe radiation sickness[/color]",
+    "[color=ff0000]Lethal dose[/color]",
+)
+
+# Compass direction <-> bearing, hoisted so the simulation path doesn't
+# rebuild the maps per run.
+_DIR_TO_DEG = {'N': 0, 'NE': 45, 'E': 90, 'SE': 135,
+               'S': 180, 'SW': 225, 'W': 270, 'NW': 315}
+_DEG_TO_DIR = {deg: name for name, deg in _DIR_TO_DEG.items()}
+
 class DoseCalculatorPopup(Popup):
     def __init__(self, dose_rate_h1, location_name, **kwargs):
         super().__init__(**kwargs)
@@ -126,8 +162,8 @@ class DoseCalculatorPopup(Popup):
         input_grid.add_widget(self.stay_input)
 
         input_grid.add_widget(Label(text="Shielding:", halign='right'))
-        self.shield_spinner = Spinner(text='Outdoors (No protection)', 
-                                     values=list(SHIELDING_FACTORS.keys()))
+        self.shield_spinner = Spinner(text='Outdoors (No protection)',
+                                     values=_SHIELDING_KEYS)
         input_grid.add_widget(self.shield_spinner)
 
         layout.add_widget(input_grid)
@@ -160,16 +196,7 @@ class DoseCalculatorPopup(Popup):
             total_dose = calculate_integrated_dose(self.dose_rate_h1, entry_time, exit_time)
             shielded_dose = total_dose * shield_factor
 
-            if shielded_dose < 50:
-                health = "[color=00ff00]No immediate symptoms[/color]"
-            elif shielded_dose < 200:
-                health = "[color=ffff00]Mild radiation sickness possible[/color]"
-            elif shielded_dose < 400:
-                health = "[color=ff8800]Moderate radiation sickness likely[/color]"
-            elif shielded_dose < 600:
-                health = "[color=ff0000]Severe radiation sickness[/color]"
-            else:
-                health = "[color=ff0000]Lethal dose[/color]"
+            health = _DOSE_HEALTH_MSGS[bisect.bisect_right(_DOSE_THRESHOLDS, shielded_dose)]
 
             result = f"""[b]Dose Results:[/b]
 
@@ -186,211 +213,258 @@ Shielded: {shielded_dose:.1f} R
         except ValueError:
             self.result_label.text = "[color=ff0000]Invalid input[/color]"
 
-class BlastCirclesWidget(Widget):
-    """Draw blast circles around GZ"""
+class _MapScaleMixin:
+    """Cache the km->pixel scale for map overlay widgets.
+
+    km_to_pixels is called several times per contour on every redraw;
+    the trig and 2**zoom only change on pan/zoom, so recompute the scale
+    in a handler bound to the map and make the hot path one multiply.
+    """
+
+    _px_per_km = 0.0
+
+    def _init_map_scale(self):
+        self.offline_map_widget.bind(lat=self._on_map_scale_changed,
+                                     zoom=self._on_map_scale_changed)
+        self._on_map_scale_changed()
+
+    def _scale_lat(self):
+        return self.offline_map_widget.lat
+
+    def _on_map_scale_changed(self, *args):
+        meters_per_pixel = (156543.03 * math.cos(math.radians(self._scale_lat()))
+                            / (2 ** self.offline_map_widget.zoom))
+        self._px_per_km = 1000.0 / meters_per_pixel if meters_per_pixel > 0 else 0.0
+
+    def km_to_pixels(self, km_distance):
+        return km_distance * self._px_per_km
+
+class BlastCirclesWidget(_MapScaleMixin, Widget):
+    """Draw blast circles around GZ as one batched Mesh"""
+
+    # Outermost first so inner circles draw on top within the one mesh.
+    _RING_KEYS = ['light', 'moderate', 'severe', 'fireball']
+    _RING_COLORS = {
+        'fireball': (1, 0, 0, 0.7),
+        'severe': (1, 0.45, 0, 0.5),
+        'moderate': (1, 0.9, 0, 0.4),
+        'light': (0.7, 0.7, 0.7, 0.25)
+    }
+    _RING_SEGMENTS = 64
+    _UNIT_RING = np.stack([np.cos(np.linspace(0, 2 * np.pi, _RING_SEGMENTS, endpoint=False)),
+                           np.sin(np.linspace(0, 2 * np.pi, _RING_SEGMENTS, endpoint=False))],
+                          axis=1)
+
     def __init__(self, yield_kt, center_lat_lon, offline_map_widget, **kwargs):
         super().__init__(**kwargs)
         self.yield_kt = yield_kt
         self.center_lat_lon = center_lat_lon
         self.offline_map_widget = offline_map_widget
+        self._init_map_scale()
+
+        # Ring colors live in a 4x1 texture sampled via per-vertex UVs, so
+        # all circles share one Mesh and hence one draw call.
+        rgba = (np.array([self._RING_COLORS[k] for k in self._RING_KEYS]) * 255)
+        texture = Texture.create(size=(len(self._RING_KEYS), 1), colorfmt='rgba')
+        texture.blit_buffer(rgba.astype(np.uint8).tobytes(),
+                            colorfmt='rgba', bufferfmt='ubyte')
+
+        indices = []
+        verts_per_ring = self._RING_SEGMENTS + 1  # center + ring points
+        for ring in range(len(self._RING_KEYS)):
+            base = ring * verts_per_ring
+            for seg in range(self._RING_SEGMENTS):
+                nxt = base + 1 + (seg + 1) % self._RING_SEGMENTS
+                indices.extend((base, base + 1 + seg, nxt))
+
+        self._mesh = Mesh(mode='triangles', indices=indices, texture=texture)
+        self._ig = InstructionGroup()
+        self._ig.add(Color(1, 1, 1, 1))
+        self._ig.add(self._mesh)
+        self.canvas.add(self._ig)
+
         self.bind(pos=self.update_blast, size=self.update_blast)
         self.offline_map_widget.bind(lat=self.update_blast, lon=self.update_blast, zoom=self.update_blast)
         Clock.schedule_once(self.update_blast, 0.05)
 
-    def km_to_pixels(self, km_distance):
-        zoom = self.offline_map_widget.zoom
-        lat = self.offline_map_widget.lat
-        meters_per_pixel = 156543.03 * math.cos(math.radians(lat)) / (2 ** zoom)
-        if meters_per_pixel <= 0:
-            return 0
-        return km_distance * 1000.0 / meters_per_pixel
+    @property
+    def yield_kt(self):
+        return self._yield_kt
+
+    @yield_kt.setter
+    def yield_kt(self, value):
+        # Radii only depend on yield, which is fixed for a simulation run,
+        # so cache them here instead of recomputing on every pan/zoom.
+        self._yield_kt = value
+        self._radii_km = {
+            'fireball': 0.15 * (value ** 0.4),
+            'severe': 0.7 * (value ** 0.33),
+            'moderate': 1.2 * (value ** 0.33),
+            'light': 2.0 * (value ** 0.33)
+        }
 
     def update_blast(self, *args):
-        self.canvas.clear()
         gz_x, gz_y = self.offline_map_widget.lat_lon_to_xy(self.center_lat_lon[0], self.center_lat_lon[1])
 
-        radii_km = {
-            'fireball': 0.15 * (self.yield_kt ** 0.4),
-            'severe': 0.7 * (self.yield_kt ** 0.33),
-            'moderate': 1.2 * (self.yield_kt ** 0.33),
-            'light': 2.0 * (self.yield_kt ** 0.33)
-        }
+        radii_km = self._radii_km
 
-        colors = {
-            'fireball': (1, 0, 0, 0.7),
-            'severe': (1, 0.45, 0, 0.5),
-            'moderate': (1, 0.9, 0, 0.4),
-            'light': (0.7, 0.7, 0.7, 0.25)
-        }
+        verts_per_ring = self._RING_SEGMENTS + 1
+        vertices = np.empty((len(self._RING_KEYS) * verts_per_ring, 4), dtype=np.float32)
+        for ring, key in enumerate(self._RING_KEYS):
+            rpx = self.km_to_pixels(radii_km[key])
+            u = (ring + 0.5) / len(self._RING_KEYS)
+            block = vertices[ring * verts_per_ring:(ring + 1) * verts_per_ring]
+            block[0] = (gz_x, gz_y, u, 0.5)
+            block[1:, 0] = gz_x + rpx * self._UNIT_RING[:, 0]
+            block[1:, 1] = gz_y + rpx * self._UNIT_RING[:, 1]
+            block[1:, 2] = u
+            block[1:, 3] = 0.5
 
-        with self.canvas:
-            for key in ['light', 'moderate', 'severe', 'fireball']:
-                radius_km = radii_km[key]
-                color = colors[key]
-                Color(*color)
-                rpx = self.km_to_pixels(radius_km)
-                Ellipse(pos=(gz_x - rpx, gz_y - rpx), size=(2 * rpx, 2 * rpx))
+        self._mesh.vertices = vertices.ravel().tolist()
 
-class DELFICPlumeWidget(Widget):
+class DELFICPlumeWidget(_MapScaleMixin, Widget):
     """DELFIC elliptical plume extending downwind - DIRECTION FIXED"""
+
+    # Contour levels hottest-first, with aligned colors (structure-of-arrays:
+    # the extents and the texture palette both index these rows directly).
+    _CONTOUR_LABELS = ('1000', '300', '100', '30', '10', '3', '1')
+    _CONTOUR_THRESHOLDS = np.array([1000, 300, 100, 30, 10, 3, 1], dtype=float)
+    _CONTOUR_COLORS = np.array([
+        (0.6, 0.0, 0.0, 0.85),
+        (1.0, 0.0, 0.0, 0.75),
+        (1.0, 0.3, 0.0, 0.65),
+        (1.0, 0.5, 0.0, 0.55),
+        (1.0, 0.7, 0.0, 0.45),
+        (1.0, 0.85, 0.0, 0.35),
+        (1.0, 0.95, 0.5, 0.25),
+    ], dtype=np.float32)
+
     def __init__(self, delfic_results, center_lat_lon, offline_map_widget, **kwargs):
         super().__init__(**kwargs)
         self.delfic_results = delfic_results
         self.center_lat_lon = center_lat_lon
         self.offline_map_widget = offline_map_widget
+        self._init_map_scale()
         self.wind_dir_deg = delfic_results['metadata']['wind_direction_deg']
-        self.ellipse_params = self._calculate_ellipse_dimensions()
+        self._contour_lengths_km, self._contour_widths_km = \
+            self._calculate_ellipse_dimensions()
+        self._display_dims = None
+        self._contour_texture = self._build_contour_texture()
+
+        x_coords = delfic_results['x_coords_km']
+        y_coords = delfic_results['y_coords_km']
+        self._tex_extent_km = (x_coords[0], y_coords[0],
+                               x_coords[-1] - x_coords[0], y_coords[-1] - y_coords[0])
+
+        # Flat-earth constants for click handling: over the plume's tens of
+        # km the local ENU approximation is accurate to <0.1%, so clicks
+        # need two multiplies and a rotation instead of haversine/bearing.
+        self._km_per_deg_lon = 111.32 * math.cos(math.radians(center_lat_lon[0]))
+        # Grid origin/step for O(1) click-to-cell lookup; the coordinate
+        # axes are uniform, so index arithmetic replaces argmin scans.
+        self._grid_x0 = float(delfic_results['x_coords_km'][0])
+        self._grid_y0 = float(delfic_results['y_coords_km'][0])
+        self._grid_res = delfic_results['resolution_km']
+        wind_rad = math.radians(self.wind_dir_deg)
+        self._wind_cos = math.cos(wind_rad)
+        self._wind_sin = math.sin(wind_rad)
+
+        # Persistent instruction group: redraws mutate the translate and
+        # rectangle in place instead of clearing and rebuilding the canvas.
+        # The plume texture extends along +x, and wind_dir_deg from the
+        # engine is already the CCW-from-East angle of the downwind axis,
+        # so it is the rotation angle directly.
+        self._translate = Translate(0, 0)
+        self._rotate = Rotate(angle=self.wind_dir_deg, origin=(0, 0))
+        self._rect = Rectangle(texture=self._contour_texture)
+        self._ig = InstructionGroup()
+        self._ig.add(Color(1, 1, 1, 1))
+        self._ig.add(PushMatrix())
+        self._ig.add(self._translate)
+        self._ig.add(self._rotate)
+        self._ig.add(self._rect)
+        self._ig.add(PopMatrix())
+        self.canvas.add(self._ig)
 
         self.bind(pos=self.update_plume, size=self.update_plume)
         self.offline_map_widget.bind(lat=self.update_plume, lon=self.update_plume, zoom=self.update_plume)
         Clock.schedule_once(self.update_plume, 0.05)
 
     def _calculate_ellipse_dimensions(self):
+        """Length/width arrays aligned with _CONTOUR_LABELS.
+
+        One digitize + find_objects pass in the engine replaces the old
+        per-threshold mask/argwhere scans; the widget just applies its
+        display minimums. Thresholds no cell reaches stay at zero.
+        """
         dose_grid = self.delfic_results['dose_grid']
         resolution_km = self.delfic_results['resolution_km']
-        center_y, center_x = dose_grid.shape[0] // 2, dose_grid.shape[1] // 2
-
-        contours = {
-            '1000': {'threshold': 1000, 'color': (0.6, 0.0, 0.0, 0.85)},
-            '300': {'threshold': 300, 'color': (1.0, 0.0, 0.0, 0.75)},
-            '100': {'threshold': 100, 'color': (1.0, 0.3, 0.0, 0.65)},
-            '30': {'threshold': 30, 'color': (1.0, 0.5, 0.0, 0.55)},
-            '10': {'threshold': 10, 'color': (1.0, 0.7, 0.0, 0.45)},
-            '3': {'threshold': 3, 'color': (1.0, 0.85, 0.0, 0.35)},
-            '1': {'threshold': 1, 'color': (1.0, 0.95, 0.5, 0.25)}
-        }
-
-        ellipse_params = {}
-
-        for label, data in contours.items():
-            threshold = data['threshold']
-            mask = dose_grid >= threshold
-
-            if not np.any(mask):
-                ellipse_params[label] = {'length_km': 0, 'width_km': 0, 'color': data['color']}
-                continue
 
-            indices = np.argwhere(mask)
-            y_indices = indices[:, 0] - center_y
-            x_indices = indices[:, 1] - center_x
+        extents = calculate_contour_extents(
+            dose_grid, resolution_km, self._CONTOUR_THRESHOLDS)
 
-            downwind_indices = x_indices[x_indices > 0]
-            if len(downwind_indices) > 0:
-                max_downwind_km = np.max(downwind_indices) * resolution_km
-            else:
-                max_downwind_km = 0
+        lengths_km = np.zeros(len(self._CONTOUR_THRESHOLDS))
+        widths_km = np.zeros(len(self._CONTOUR_THRESHOLDS))
+        for i, threshold in enumerate(self._CONTOUR_THRESHOLDS):
+            extent = extents[float(threshold)]
+            if extent is not None:
+                lengths_km[i] = max(extent[0], resolution_km * 1.0)
+                widths_km[i] = max(extent[1], resolution_km * 0.3)
 
-            if len(y_indices) > 0:
-                y_min = np.min(y_indices) * resolution_km
-                y_max = np.max(y_indices) * resolution_km
-                full_width_km = y_max - y_min
-            else:
-                full_width_km = 0
+        return lengths_km, widths_km
 
-            min_length = resolution_km * 1.0
-            min_width = resolution_km * 0.3
+    def _build_contour_texture(self):
+        """Render the dose grid into one RGBA contour texture.
 
-            length_km = max(max_downwind_km, min_length)
-            width_km = max(full_width_km, min_width)
-
-            ellipse_params[label] = {
-                'length_km': length_km,
-                'width_km': width_km,
-                'color': data['color']
-            }
-
-        return ellipse_params
+        Seven overlapping filled ellipses made the GPU shade the plume
+        core seven times per frame. Banding the grid once through
+        np.digitize and blitting a texture turns every redraw into a
+        single rotated Rectangle, and the texture only changes when the
+        DELFIC results do.
+        """
+        dose_grid = self.delfic_results['dose_grid']
+        # Palette from the shared contour table (ascending for digitize),
+        # with a transparent band below the faintest contour.
+        thresholds = self._CONTOUR_THRESHOLDS[::-1]
+        band_colors = np.vstack([np.zeros(4, dtype=np.float32),
+                                 self._CONTOUR_COLORS[::-1]])
+        rgba = (band_colors[np.digitize(dose_grid, thresholds)] * 255).astype(np.uint8)
+
+        texture = Texture.create(size=(dose_grid.shape[1], dose_grid.shape[0]),
+                                 colorfmt='rgba')
+        texture.blit_buffer(rgba.tobytes(), colorfmt='rgba', bufferfmt='ubyte')
+        return texture
 
     def get_dimensions_for_display(self):
-        dimensions = {}
-        for label, params in self.ellipse_params.items():
-            dimensions[label] = {
-                'length': params['length_km'],
-                'width': params['width_km']
+        if self._display_dims is None:
+            self._display_dims = {
+                label: {'length': float(length), 'width': float(width)}
+                for label, length, width in zip(self._CONTOUR_LABELS,
+                                                self._contour_lengths_km,
+                                                self._contour_widths_km)
             }
-        return dimensions
-
-    def km_to_pixels(self, km_distance):
-        zoom = self.offline_map_widget.zoom
-        lat = self.offline_map_widget.lat
-        meters_per_pixel = 156543.03 * math.cos(math.radians(lat)) / (2 ** zoom)
-        if meters_per_pixel <= 0:
-            return 0
-        return km_distance * 1000.0 / meters_per_pixel
+        return self._display_dims
 
     def update_plume(self, *args):
-        self.canvas.clear()
         gz_x, gz_y = self.offline_map_widget.lat_lon_to_xy(self.center_lat_lon[0], self.center_lat_lon[1])
 
-       
-        
-        if self.wind_dir_deg == 0:  
+        x0_km, y0_km, w_km, h_km = self._tex_extent_km
 
-            kivy_angle = 90
-        elif self.wind_dir_deg == 135 or self.wind_dir_deg == 315:
-            kivy_angle = wind_to_plume_angle(self.wind_dir_deg)
-        else:
-            kivy_angle = -135
-    
-        contour_order = ['1', '3', '10', '30', '100', '300', '1000']
-
-        with self.canvas:
-            for label in contour_order:
-                if label not in self.ellipse_params:
-                    continue
-
-                params = self.ellipse_params[label]
-                if params['length_km'] <= 0 or params['width_km'] <= 0:
-                    continue
-
-                length_px = self.km_to_pixels(params['length_km'])
-                width_px = self.km_to_pixels(params['width_km'])
-                a_px = length_px / 2.0
-                b_px = width_px / 2.0
-
-                Color(*params['color'])
-                PushMatrix()
-                Translate(gz_x, gz_y)
-                Rotate(angle=kivy_angle, origin=(0, 0))
-                Ellipse(pos=(0, -b_px), size=(2 * a_px, 2 * b_px))
-                PopMatrix()
+        self._translate.xy = (gz_x, gz_y)
+        self._rect.pos = (self.km_to_pixels(x0_km), self.km_to_pixels(y0_km))
+        self._rect.size = (self.km_to_pixels(w_km), self.km_to_pixels(h_km))
 
     def on_touch_down(self, touch):
         if self.collide_point(*touch.pos):
             touch.ud['plume_click'] = True
             lat, lon = self.offline_map_widget.xy_to_lat_lon(touch.x, touch.y)
 
-            gz_lat, gz_lon = self.center_lat_lon
-            R = 6371
-
-            lat1_rad = math.radians(gz_lat)
-            lat2_rad = math.radians(lat)
-            dlon_rad = math.radians(lon - gz_lon)
-
-            y = math.sin(dlon_rad) * math.cos(lat2_rad)
-            x = math.cos(lat1_rad) * math.sin(lat2_rad) - \
-                math.sin(lat1_rad) * math.cos(lat2_rad) * math.cos(dlon_rad)
-
-            bearing_deg = (math.degrees(math.atan2(y, x)) + 360) % 360
-
-            dLat = math.radians(lat - gz_lat)
-            a = math.sin(dLat / 2)**2 + math.cos(lat1_rad) * \
-                math.cos(lat2_rad) * math.sin(dlon_rad / 2)**2
-            c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-            distance_km = R * c
-
-            plume_calculation_angle = self.wind_dir_deg
-            relative_angle_rad = math.radians(bearing_deg - self.wind_dir_deg)
-
-            x_plume_km = distance_km * math.cos(relative_angle_rad)
-            y_plume_km = distance_km * math.sin(relative_angle_rad)
-
-            res = self.delfic_results['resolution_km']
-            x_coords = self.delfic_results['x_coords_km']
-            y_coords = self.delfic_results['y_coords_km']
+            x_plume_km, y_plume_km = latlon_to_frame_km(
+                lat, lon, self.center_lat_lon, self._km_per_deg_lon,
+                self._wind_cos, self._wind_sin)
 
-            ix = (np.abs(x_coords - x_plume_km)).argmin()
-            iy = (np.abs(y_coords - y_plume_km)).argmin()
+            ix = int(round((x_plume_km - self._grid_x0) / self._grid_res))
+            iy = int(round((y_plume_km - self._grid_y0) / self._grid_res))
 
             if 0 <= iy < self.delfic_results['dose_grid'].shape[0] and \
                0 <= ix < self.delfic_results['dose_grid'].shape[1]:
@@ -408,9 +482,9 @@ class DELFICPlumeWidget(Widget):
             return True
         return super().on_touch_down(touch)
 
-class PlumeDrawingWidget(Widget):
+class PlumeDrawingWidget(_MapScaleMixin, Widget):
     """WSEG plume widget - DIRECTION FIXED"""
-    def __init__(self, all_plume_dimensions_km, plume_angle_deg, plume_center_lat_lon, 
+    def __init__(self, all_plume_dimensions_km, plume_angle_deg, plume_center_lat_lon,
                  offline_map_widget, app_instance, **kwargs):
         super().__init__(**kwargs)
         self.all_plume_dimensions_km = all_plume_dimensions_km
@@ -418,21 +492,84 @@ class PlumeDrawingWidget(Widget):
         self.plume_center_lat_lon = plume_center_lat_lon
         self.offline_map_widget = offline_map_widget
         self.app_instance = app_instance
+        self._init_map_scale()
+
+        # Flat-earth click constants, as in DELFICPlumeWidget; the WSEG
+        # grid is oriented along the downwind axis.
+        self._km_per_deg_lon = 111.32 * math.cos(math.radians(plume_center_lat_lon[0]))
+        downwind_rad = math.radians((plume_angle_deg + 180) % 360)
+        self._downwind_cos = math.cos(downwind_rad)
+        self._downwind_sin = math.sin(downwind_rad)
+
+        # Yield is fixed for a simulation run; parse it and take the cube
+        # root once instead of on every pan/zoom redraw.
+        try:
+            yield_kt = float(self.app_instance.yield_text_input.text)
+        except (AttributeError, ValueError):
+            yield_kt = 10.0
+        self._yield_scale = (yield_kt / 10.0) ** 0.33
+
+        # Persistent canvas instructions, mutated in place on redraw. The
+        # ellipses extend along +y, so rotating North to the downwind
+        # bearing (wind + 180, clockwise) is a CCW kivy rotation of
+        # -(wind + 180) == 180 - wind; this reproduces every value of the
+        # old eight-way branch ladder.
+        blast_circle_specs = [
+            (1.41, (0.8, 0.7, 0.5, 0.25)),
+            (0.99, (1, 1, 0, 0.35)),
+            (0.469, (1, 0.6, 0, 0.45)),
+            (0.15, (1, 1, 0.3, 0.7)),
+        ]
+        fallout_contour_colors = {
+            '10': (1, 1, 0, 0.5),
+            '100': (1, 0.6, 0, 0.6),
+            '1000': (1, 0, 0, 0.7),
+        }
+
+        self._ig = InstructionGroup()
+        self._blast_circles = []
+        for radius_km, color in blast_circle_specs:
+            self._ig.add(Color(*color))
+            ellipse = Ellipse(size=(0, 0))
+            self._blast_circles.append((radius_km, ellipse))
+            self._ig.add(ellipse)
+
+        self._ig.add(PushMatrix())
+        self._translate = Translate(0, 0)
+        self._rotate = Rotate(angle=(180 - plume_angle_deg) % 360, origin=(0, 0))
+        self._ig.add(self._translate)
+        self._ig.add(self._rotate)
+
+        self._contour_ellipses = {}
+        for level in ('10', '100', '1000'):
+            self._ig.add(Color(*fallout_contour_colors[level]))
+            ellipse = Ellipse(size=(0, 0))
+            self._contour_ellipses[level] = ellipse
+            self._ig.add(ellipse)
+        self._ig.add(PopMatrix())
+        self.canvas.add(self._ig)
+
+        # Dimensions are fixed for a run, so resolve the dict lookups once:
+        # the render loop iterates flat (length_km, width_km, ellipse) rows.
+        # Contours with no extent keep their default (0, 0) size and stay hidden.
+        self._contour_draw_rows = []
+        for level, ellipse in self._contour_ellipses.items():
+            dim_km = self.all_plume_dimensions_km.get(level)
+            if dim_km and dim_km['length'] > 0 and dim_km['width'] > 0:
+                self._contour_draw_rows.append(
+                    (dim_km['length'], dim_km['width'], ellipse))
 
         self.bind(pos=self.update_plume, size=self.update_plume)
         self.offline_map_widget.bind(lat=self.update_plume, lon=self.update_plume, 
                                      zoom=self.update_plume)
         Clock.schedule_once(self.update_plume, 0.1)
 
-    def km_to_pixels(self, km_distance):
-        lat = self.plume_center_lat_lon[0]
-        zoom = self.offline_map_widget.zoom
-        meters_per_pixel = 156543.03 * math.cos(math.radians(lat)) / (2 ** zoom)
-        pixels = (km_distance * 1000) / meters_per_pixel
-        return pixels
+    def _scale_lat(self):
+        # This widget historically scales at the plume center's latitude,
+        # which is fixed for a run, rather than the map center's.
+        return self.plume_center_lat_lon[0]
 
     def update_plume(self, *args):
-        self.canvas.clear()
         if not self.all_plume_dimensions_km:
             return
 
@@ -440,108 +577,31 @@ class PlumeDrawingWidget(Widget):
             self.plume_center_lat_lon[0], self.plume_center_lat_lon[1]
         )
 
-        try:
-            yield_kt = float(self.app_instance.yield_text_input.text)
-        except:
-            yield_kt = 10.0
-
-        yield_scale = (yield_kt / 10.0) ** 0.33
-
-        with self.canvas:
-            blast_circles = [
-                {'radius_km': 1.41, 'color': (0.8, 0.7, 0.5, 0.25)},
-                {'radius_km': 0.99, 'color': (1, 1, 0, 0.35)},
-                {'radius_km': 0.469, 'color': (1, 0.6, 0, 0.45)},
-                {'radius_km': 0.15, 'color': (1, 1, 0.3, 0.7)},
-            ]
-
-            for circle in blast_circles:
-                radius_px = self.km_to_pixels(circle['radius_km'] * yield_scale)
-                Color(*circle['color'])
-                Ellipse(pos=(plume_x - radius_px, plume_y - radius_px), 
-                        size=(radius_px*2, radius_px*2))
-
-            PushMatrix()
-            Translate(plume_x, plume_y)
-
-            if self.plume_angle_deg == 0:  
-
-                kivy_angle = 180
-            elif self.plume_angle_deg == 45:  
-
-                kivy_angle = 135
-            elif self.plume_angle_deg == 90:  
+        yield_scale = self._yield_scale
 
-                kivy_angle = 90
-            elif self.plume_angle_deg == 135:  
-
-                kivy_angle = 45
-            elif  self.plume_angle_deg == 180:  
-
-                kivy_angle = 0
-            elif self.plume_angle_deg == 225:  
-
-                kivy_angle = -45
-            elif self.plume_angle_deg == 270:  
-
-                kivy_angle = -90
-            elif self.plume_angle_deg == 315:  
-
-                kivy_angle = -135
-            else:
-                kivy_angle = wind_to_plume_angle(self.plume_angle_deg)
-
-            Rotate(angle=kivy_angle, origin=(0, 0))
-
-            fallout_contours = {
-                '1000': (1, 0, 0, 0.7),
-                '100': (1, 0.6, 0, 0.6),
-                '10': (1, 1, 0, 0.5),
-            }
+        for radius_km, ellipse in self._blast_circles:
+            radius_px = self.km_to_pixels(radius_km * yield_scale)
+            ellipse.pos = (plume_x - radius_px, plume_y - radius_px)
+            ellipse.size = (radius_px * 2, radius_px * 2)
 
-            for dose_rate_str in ['10', '100', '1000']:
-                if dose_rate_str not in self.all_plume_dimensions_km:
-                    continue
+        self._translate.xy = (plume_x, plume_y)
 
-                dim_km = self.all_plume_dimensions_km[dose_rate_str]
-
-                if dim_km['length'] <= 0 or dim_km['width'] <= 0:
-                    continue
-
-                length_px = self.km_to_pixels(dim_km['length'])
-                width_px = self.km_to_pixels(dim_km['width'])
-
-                Color(*fallout_contours[dose_rate_str])
-                Ellipse(pos=(-width_px/2, 0), size=(width_px, length_px))
-
-            PopMatrix()
+        for length_km, width_km, ellipse in self._contour_draw_rows:
+            length_px = self.km_to_pixels(length_km)
+            width_px = self.km_to_pixels(width_km)
+            ellipse.pos = (-width_px / 2, 0)
+            ellipse.size = (width_px, length_px)
 
     def on_touch_down(self, touch):
         if self.collide_point(*touch.pos):
             lat, lon = self.offline_map_widget.xy_to_lat_lon(touch.x, touch.y)
 
             if BACKEND_AVAILABLE and hasattr(self.app_instance, 'wseg_params') and self.app_instance.wseg_params:
-                R = 6371
-                lat1, lon1 = self.plume_center_lat_lon
-                lat2, lon2 = lat, lon
-
-                dlat = math.radians(lat2 - lat1)
-                dlon = math.radians(lon2 - lon1)
-
-                a = math.sin(dlat/2)**2 + math.cos(math.radians(lat1)) * \
-                    math.cos(math.radians(lat2)) * math.sin(dlon/2)**2
-                distance_km = 2 * R * math.atan2(math.sqrt(a), math.sqrt(1-a))
-
-                y = math.sin(dlon) * math.cos(math.radians(lat2))
-                x = math.cos(math.radians(lat1)) * math.sin(math.radians(lat2)) - \
-                    math.sin(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.cos(dlon)
-                bearing = math.degrees(math.atan2(y, x))
-
-                downwind_deg = (self.plume_angle_deg + 180) % 360
-                angle_diff = (bearing - downwind_deg) % 360
-
-                x_mi = distance_km * 0.621371 * math.cos(math.radians(angle_diff))
-                y_mi = distance_km * 0.621371 * math.sin(math.radians(angle_diff))
+                x_km, y_km = latlon_to_frame_km(
+                    lat, lon, self.plume_center_lat_lon, self._km_per_deg_lon,
+                    self._downwind_cos, self._downwind_sin)
+                x_mi = x_km * 0.621371
+                y_mi = y_km * 0.621371
 
                 dose_rate = calculate_dose_rate_at_point(x_mi, y_mi, self.app_instance.wseg_params)
 
@@ -639,15 +699,15 @@ class NuclearApp(App):
                                                       values=['N', 'NE', 'E', 'SE', 
                                                              'S', 'SW', 'W', 'NW']))
 
-        location_values = sorted([loc.title() for loc in DELHI_LOCATIONS.keys()])
+        location_values = _LOCATION_VALUES
         default_location = location_values[0] if location_values else 'Select location...'
 
         self.location_spinner = self.add_control(input_grid, "Target Location:", 
                                         Spinner(text=default_location, 
                                                values=location_values))
 
-        density_values = list(POPULATION_DENSITIES.keys())
-        self.density_spinner = self.add_control(input_grid, "Population Type:", 
+        density_values = _DENSITY_KEYS
+        self.density_spinner = self.add_control(input_grid, "Population Type:",
                                                Spinner(text='Urban Delhi (15,000/km²)', 
                                                       values=density_values))
 
@@ -705,28 +765,33 @@ class NuclearApp(App):
         layout.add_widget(widget)
         return widget
 
+    # (input attribute, valid-range predicate, range error, parse error)
+    _NUMERIC_CHECKS = (
+        ('yield_text_input', lambda v: 0 < v <= 50000,
+         "Yield: 1-50,000 kt", "Yield must be number"),
+        ('wind_ground_input', lambda v: 0 <= v <= 200,
+         "Wind: 0-200 km/h", "Wind must be number"),
+    )
+    _SPINNER_CHECKS = (
+        ('burst_height_spinner', 'Select...', "Select burst height"),
+        ('wind_direction_spinner', 'Select...', "Select wind direction"),
+        ('location_spinner', 'Select location...', "Select location"),
+    )
+
     def validate_inputs(self):
         errors = []
-        try:
-            yield_kt = float(self.yield_text_input.text.strip())
-            if yield_kt <= 0 or yield_kt > 50000:
-                errors.append("Yield: 1-50,000 kt")
-        except ValueError:
-            errors.append("Yield must be number")
-
-        try:
-            wind_speed = float(self.wind_ground_input.text.strip())
-            if wind_speed < 0 or wind_speed > 200:
-                errors.append("Wind: 0-200 km/h")
-        except ValueError:
-            errors.append("Wind must be number")
+        for attr, in_range, range_msg, parse_msg in self._NUMERIC_CHECKS:
+            try:
+                value = float(getattr(self, attr).text.strip())
+            except ValueError:
+                errors.append(parse_msg)
+                continue
+            if not in_range(value):
+                errors.append(range_msg)
 
-        if self.burst_height_spinner.text == 'Select...':
-            errors.append("Select burst height")
-        if self.wind_direction_spinner.text == 'Select...':
-            errors.append("Select wind direction")
-        if self.location_spinner.text == 'Select location...':
-            errors.append("Select location")
+        for attr, placeholder, msg in self._SPINNER_CHECKS:
+            if getattr(self, attr).text == placeholder:
+                errors.append(msg)
 
         if self.density_spinner.text == 'Custom':
             try:
@@ -753,56 +818,112 @@ class NuclearApp(App):
             return
 
         self.results_label.text = "[b][color=ffff00]Calculating...[/color][/b]"
-        Clock.schedule_once(self.execute_simulation, 0.1)
 
-    def execute_simulation(self, dt=None):
+        # Snapshot the inputs on the UI thread, run the numeric models on
+        # a worker so the UI stays responsive, then marshal the results
+        # back to the main thread for widget construction.
         try:
             yield_kt = float(self.yield_text_input.text.strip())
             wind_speed = float(self.wind_ground_input.text.strip())
-            burst_height_text = self.burst_height_spinner.text
-            location_name = self.location_spinner.text.lower().strip()
-            wind_direction = self.wind_direction_spinner.text.upper()
-            model_choice = self.model_spinner.text
-
             density_selection = self.density_spinner.text
             if density_selection == 'Custom':
                 population_density = float(self.custom_density_input.text.strip())
             else:
                 population_density = POPULATION_DENSITIES[density_selection]
+        except ValueError as e:
+            self.results_label.text = f"[b][color=ff0000]Error:[/color][/b]\n\n{str(e)}"
+            return
 
-            coords = get_coordinates(location_name)
-            if not coords:
-                raise ValueError(f"Location not found")
-            lat, lon = coords
-
-            self.offline_map.center_on(lat, lon)
+        params = {
+            'yield_kt': yield_kt,
+            'wind_speed': wind_speed,
+            'population_density': population_density,
+            'burst_height_text': self.burst_height_spinner.text,
+            'location_name': self.location_spinner.text.lower().strip(),
+            'wind_direction': self.wind_direction_spinner.text.upper(),
+            'model_choice': self.model_spinner.text,
+        }
+        threading.Thread(target=self._simulate_worker, args=(params,),
+                         daemon=True).start()
 
-            blast_widget = BlastCirclesWidget(
-                yield_kt=yield_kt,
-                center_lat_lon=(lat, lon),
-                offline_map_widget=self.offline_map
-            )
-            self.plume_drawing_layer.add_widget(blast_widget)
+    def _simulate_worker(self, params):
+        """Run the numeric models off the UI thread."""
+        try:
+            coords = get_coordinates(params['location_name'])
+            if not coords:
+                raise ValueError("Location not found")
+            params['lat'], params['lon'] = coords
 
-            direction_map = {'N': 0, 'NE': 45, 'E': 90, 'SE': 135, 
-                           'S': 180, 'SW': 225, 'W': 270, 'NW': 315}
-            plume_angle = direction_map.get(wind_direction, 90)
+            params['plume_angle'] = _DIR_TO_DEG.get(params['wind_direction'], 90)
 
-            use_delfic = ('DELFIC' in model_choice and DELFIC_AVAILABLE and burst_height_text == "Ground")
+            use_delfic = ('DELFIC' in params['model_choice'] and DELFIC_AVAILABLE
+                          and params['burst_height_text'] == "Ground")
+            params['use_delfic'] = use_delfic
 
             if use_delfic:
                 print("\n" + "="*60)
                 print("RUNNING DELFIC SIMULATION")
                 print("="*60)
 
-                delfic_result = calculate_delfic_plume(
-                    yield_kt=yield_kt,
-                    wind_speed_kph=wind_speed,
-                    wind_direction_deg=plume_angle,
-                    population_density=population_density,
+                params['delfic_result'] = calculate_delfic_plume(
+                    yield_kt=params['yield_kt'],
+                    wind_speed_kph=params['wind_speed'],
+                    wind_direction_deg=params['plume_angle'],
+                    population_density=params['population_density'],
                     resolution_km=0.5,
                     max_distance_km=150
                 )
+            else:
+                print("\n" + "="*60)
+                print("RUNNING WSEG-10 SIMULATION")
+                print("="*60)
+
+                if not BACKEND_AVAILABLE:
+                    raise RuntimeError("WSEG-10 backend not available")
+
+                params['contours'], params['wseg_params'] = calculate_isodose_contour_dimensions(
+                    yield_kt=int(params['yield_kt']),
+                    surface_wind_kph=int(params['wind_speed']),
+                    burst_height=params['burst_height_text']
+                )
+                params['casualties'] = calculate_casualties(
+                    yield_kt=int(params['yield_kt']),
+                    population_density=params['population_density'])
+
+            Clock.schedule_once(lambda dt: self._apply_results(params))
+
+        except Exception as e:
+            error_msg = f"[b][color=ff0000]Error:[/color][/b]\n\n{str(e)}"
+            print("\n" + "="*60)
+            print("ERROR IN SIMULATION:")
+            traceback.print_exc()
+            print("="*60 + "\n")
+            Clock.schedule_once(
+                lambda dt: setattr(self.results_label, 'text', error_msg))
+
+    def _apply_results(self, params):
+        """Build widgets and results text on the UI thread."""
+        try:
+            yield_kt = params['yield_kt']
+            wind_speed = params['wind_speed']
+            burst_height_text = params['burst_height_text']
+            location_name = params['location_name']
+            wind_direction = params['wind_direction']
+            population_density = params['population_density']
+            lat, lon = params['lat'], params['lon']
+            plume_angle = params['plume_angle']
+
+            self.offline_map.center_on(lat, lon)
+
+            blast_widget = BlastCirclesWidget(
+                yield_kt=yield_kt,
+                center_lat_lon=(lat, lon),
+                offline_map_widget=self.offline_map
+            )
+            self.plume_drawing_layer.add_widget(blast_widget)
+
+            if params['use_delfic']:
+                delfic_result = params['delfic_result']
 
                 self.delfic_results = delfic_result
                 self.wseg_params = None
@@ -817,11 +938,9 @@ class NuclearApp(App):
 
                 plume_dimensions = delfic_plume_widget.get_dimensions_for_display()
 
-                direction_map_reverse = {0: 'N', 45: 'NE', 90: 'E', 135: 'SE', 
-                             180: 'S', 225: 'SW', 270: 'W', 315: 'NW'}
-                wind_dir_text = direction_map_reverse.get(plume_angle, wind_direction)
+                wind_dir_text = _DEG_TO_DIR.get(plume_angle, wind_direction)
 
-                results_text = f"""[b]NUCLEAR EFFECTS - DELFIC MODEL[/b]
+                parts = [f"""[b]NUCLEAR EFFECTS - DELFIC MODEL[/b]
 
 [b]Yield:[/b] {yield_kt:.0f} kt | [b]Wind:[/b] {wind_speed:.0f} km/h {wind_dir_text}
 [b]Location:[/b] {location_name.title()}
@@ -830,46 +949,34 @@ class NuclearApp(App):
 Fatalities: [color=ff0000]{casualty_data['fatal_casualties']:,}[/color]
 Injuries: [color=ffff00]{casualty_data['severe_casualties'] + casualty_data['moderate_casualties']:,}[/color]
 
-[b]Fallout:[/b]"""
+[b]Fallout:[/b]"""]
                 display_mapping = {'1000': '1000', '100': '100', '1': '10'}
 
                 for internal_level, display_level in display_mapping.items():
                     if internal_level in plume_dimensions:
                         dim = plume_dimensions[internal_level]
                         if dim['length'] > 0:
-                            results_text += f"\n{display_level} R/hr: {dim['length']:.1f}×{dim['width']:.1f} km"
+                            parts.append(f"\n{display_level} R/hr: {dim['length']:.1f}×{dim['width']:.1f} km")
 
-                results_text += "\n\n[color=00ffff]Click plume for dose calc[/color]"
+                parts.append("\n\n[color=00ffff]Click plume for dose calc[/color]")
 
-                self.results_label.text = results_text
+                self.results_label.text = "".join(parts)
                 self.plume_drawing_layer.add_widget(delfic_plume_widget)
                 model_used = "DELFIC"
 
             else:
-                print("\n" + "="*60)
-                print("RUNNING WSEG-10 SIMULATION")
-                print("="*60)
-
-                if not BACKEND_AVAILABLE:
-                    raise RuntimeError("WSEG-10 backend not available")
-
-                all_plume_dimensions_km, self.wseg_params = calculate_isodose_contour_dimensions(
-                    yield_kt=int(yield_kt), 
-                    surface_wind_kph=int(wind_speed), 
-                    burst_height=burst_height_text
-                )
-
+                all_plume_dimensions_km = params['contours']
+                self.wseg_params = params['wseg_params']
                 self.delfic_results = None
                 model_used = "WSEG-10"
 
-                casualties = calculate_casualties(yield_kt=int(yield_kt), 
-                                                population_density=population_density)
+                casualties = params['casualties']
 
                 plume_10 = all_plume_dimensions_km.get('10', {'length': 0, 'width': 0})
                 plume_100 = all_plume_dimensions_km.get('100', {'length': 0, 'width': 0})
                 plume_1000 = all_plume_dimensions_km.get('1000', {'length': 0, 'width': 0})
 
-                results_text = f"""[b]NUCLEAR EFFECTS - {model_used}[/b]
+                parts = [f"""[b]NUCLEAR EFFECTS - {model_used}[/b]
 
 Yield: {yield_kt:.0f} kt | Wind: {wind_speed:.0f} km/h {wind_direction}
 Location: {location_name.title()}
@@ -878,21 +985,21 @@ Location: {location_name.title()}
 Fatalities: [color=ff0000]{casualties.get('fatalities', 0):,}[/color]
 Injuries: [color=ffff00]{casualties.get('injuries', 0):,}[/color]
 
-[b]Fallout:[/b]"""
+[b]Fallout:[/b]"""]
 
                 if burst_height_text == "Ground":
                     if plume_1000['length'] > 0:
-                        results_text += f"\n1000 R/hr: {plume_1000['length']:.1f}×{plume_1000['width']:.1f} km"
+                        parts.append(f"\n1000 R/hr: {plume_1000['length']:.1f}×{plume_1000['width']:.1f} km")
                     if plume_100['length'] > 0:
-                        results_text += f"\n100 R/hr: {plume_100['length']:.1f}×{plume_100['width']:.1f} km"
+                        parts.append(f"\n100 R/hr: {plume_100['length']:.1f}×{plume_100['width']:.1f} km")
                     if plume_10['length'] > 0:
-                        results_text += f"\n10 R/hr: {plume_10['length']:.1f}×{plume_10['width']:.1f} km"
+                        parts.append(f"\n10 R/hr: {plume_10['length']:.1f}×{plume_10['width']:.1f} km")
 
-                    results_text += "\n\n[color=00ffff]Click plume for dose calc[/color]"
+                    parts.append("\n\n[color=00ffff]Click plume for dose calc[/color]")
                 else:
-                    results_text += "\n[color=888888]Minimal (airburst)[/color]"
+                    parts.append("\n[color=888888]Minimal (airburst)[/color]")
 
-                self.results_label.text = results_text
+                self.results_label.text = "".join(parts)
 
                 if burst_height_text == "Ground" and plume_10['length'] > 0:
                     plume_widget = PlumeDrawingWidget(
@@ -1,21 +1,75 @@
 import os
+import numpy as np
 import requests
-from math import log, tan, pi, radians, floor, cos, ceil, atan, exp, sin, atan2, sqrt
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from math import log, tan, pi, radians, floor, cos, ceil, atan, exp, sin, sinh, atan2, sqrt
 import time
-import random
 from kivy.uix.widget import Widget
-from kivy.graphics import Color, Rectangle
+from kivy.graphics import Color, InstructionGroup, Rectangle
 from kivy.properties import BoundedNumericProperty, NumericProperty
 from kivy.core.image import Image as CoreImage
 from kivy.clock import Clock
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# One pooled session for all tile fetches: connections (and their TLS
+# handshakes) are reused across requests instead of re-opened per tile.
+_session = requests.Session()
+_session.headers.update({'User-Agent': 'Nuclear Fallout Simulator/1.0 (Educational Use)'})
+_adapter = requests.adapters.HTTPAdapter(
+    pool_connections=4, pool_maxsize=32,
+    max_retries=requests.adapters.Retry(total=3, backoff_factor=0.5,
+                                        status_forcelist=[500, 502, 503, 504]))
+_session.mount('https://', _adapter)
+
+# Tile fetches run on this pool so the UI thread never blocks on the
+# network; the token-bucket below keeps us at ~2 requests/s per the OSM
+# tile usage policy even with 8 workers in flight.
+_TILE_POOL = ThreadPoolExecutor(max_workers=8)
+_MIN_REQUEST_INTERVAL = 0.5
+_rate_lock = threading.Lock()
+_next_request_time = 0.0
+
+def _throttle():
+    global _next_request_time
+    with _rate_lock:
+        now = time.monotonic()
+        wait = _next_request_time - now
+        _next_request_time = max(now, _next_request_time) + _MIN_REQUEST_INTERVAL
+    if wait > 0:
+        time.sleep(wait)
+
+def _merc_forward_v(lats, lons, n):
+    """Web-Mercator forward projection to tile units, array in/array out."""
+    lat_rad = np.radians(lats)
+    xs = (lons + 180.0) / 360.0 * n
+    ys = (1.0 - np.log(np.tan(lat_rad) + 1.0 / np.cos(lat_rad)) / np.pi) / 2.0 * n
+    return xs, ys
+
+def _merc_inverse_v(xs, ys, n):
+    """Web-Mercator inverse projection from tile units, array in/array out."""
+    lats = np.degrees(np.arctan(np.sinh(np.pi * (1.0 - 2.0 * ys / n))))
+    lons = xs / n * 360.0 - 180.0
+    return lats, lons
+
+if NUMBA_AVAILABLE:
+    _merc_forward_v = njit(cache=True, fastmath=True)(_merc_forward_v)
+    _merc_inverse_v = njit(cache=True, fastmath=True)(_merc_inverse_v)
+
+@lru_cache(maxsize=512)
+def _load_texture(tile_path):
+    """Decode a tile PNG and upload it once; pans then reuse the texture."""
+    return CoreImage(tile_path).texture
+
 def sec(x):
     return 1 / cos(x)
 
-def sinh(x):
-    """Hyperbolic sine function"""
-    return (exp(x) - exp(-x)) / 2.0
-
 def lat_lon_to_tile(lat, lon, zoom):
     """Convert latitude/longitude to tile coordinates"""
     lat_rad = radians(lat)
@@ -52,10 +106,9 @@ def download_tile(x, y, zoom, tiles_folder='tiles'):
 
     try:
         url = f"https://tile.openstreetmap.org/{zoom}/{x}/{y}.png"
-        headers = {'User-Agent': 'Nuclear Fallout Simulator/1.0 (Educational Use)'}
-        time.sleep(0.1 + random.uniform(0, 0.1))
+        _throttle()
 
-        response = requests.get(url, headers=headers, timeout=10)
+        response = _session.get(url, timeout=10, stream=False)
         response.raise_for_status()
 
         with open(tile_path, 'wb') as f:
@@ -90,9 +143,31 @@ class OfflineMap(Widget):
         self.touch_start_pos = None
         self.initial_lat = self.lat
         self.initial_lon = self.lon
+        self._inflight_tiles = set()
+        self._known_tiles = set()
+        self._failed_tiles = {}
+        self._retry_cooldown_s = 30.0
 
-        self.bind(pos=self.redraw_map, size=self.redraw_map)
-        self.bind(lat=self.redraw_map, lon=self.redraw_map, zoom=self.redraw_map)
+        # Persistent canvas: one background rect plus a Rectangle per tile
+        # slot, mutated in place on pan instead of rebuilt every frame.
+        with self.canvas:
+            Color(0.9, 0.9, 0.9, 1)
+            self._bg_rect = Rectangle(pos=self.pos, size=self.size)
+        self._tile_ig = InstructionGroup()
+        self.canvas.add(self._tile_ig)
+        self._tile_rects = {}
+
+        self._update_proj_cache()
+        self.bind(lat=self._update_proj_cache, lon=self._update_proj_cache,
+                  zoom=self._update_proj_cache)
+        self.bind(zoom=self._on_zoom_changed)
+
+        # A drag sample mutates lat and lon back to back; the trigger
+        # coalesces both property events into a single redraw per frame.
+        self._redraw_trigger = Clock.create_trigger(self.redraw_map, 0)
+        self.bind(pos=self._redraw_trigger, size=self._redraw_trigger)
+        self.bind(lat=self._redraw_trigger, lon=self._redraw_trigger,
+                  zoom=self._redraw_trigger)
 
         Clock.schedule_once(self.redraw_map, 0.1)
 
@@ -110,38 +185,62 @@ class OfflineMap(Widget):
         return (self.delhi_bounds['south'] <= lat <= self.delhi_bounds['north'] and
                 self.delhi_bounds['west'] <= lon <= self.delhi_bounds['east'])
 
+    def _on_zoom_changed(self, *args):
+        # Tiles from other zoom levels won't be shown again soon; drop
+        # them so the texture cache holds the current level.
+        _load_texture.cache_clear()
+
+    def _update_proj_cache(self, *args):
+        """Cache the map center's Mercator projection.
+
+        The center only moves when lat/lon/zoom change, but every overlay
+        point converted during a redraw used to re-derive it from scratch.
+        """
+        self._n = 2.0 ** self.zoom
+        lat_rad = radians(self.lat)
+        self._cx_merc = (self.lon + 180.0) / 360.0 * self._n
+        self._cy_merc = (1.0 - log(tan(lat_rad) + 1.0 / cos(lat_rad)) / pi) / 2.0 * self._n
+
     def lat_lon_to_xy(self, lat, lon):
         """Convert lat/lon to widget pixel coordinates - FIXED VERSION"""
-        n = 2.0 ** self.zoom
+        lat_rad = radians(lat)
+        target_x = (lon + 180.0) / 360.0 * self._n
+        target_y = (1.0 - log(tan(lat_rad) + 1.0 / cos(lat_rad)) / pi) / 2.0 * self._n
 
-        center_x = (self.lon + 180.0) / 360.0 * n
-        center_y = (1.0 - log(tan(radians(self.lat)) + sec(radians(self.lat))) / pi) / 2.0 * n
+        pixel_x = self.center_x + (target_x - self._cx_merc) * self.tile_size
+        pixel_y = self.center_y + (target_y - self._cy_merc) * self.tile_size
 
-        target_x = (lon + 180.0) / 360.0 * n
-        target_y = (1.0 - log(tan(radians(lat)) + sec(radians(lat))) / pi) / 2.0 * n
+        return pixel_x, pixel_y
 
-        pixel_x = self.center_x + (target_x - center_x) * self.tile_size
-        pixel_y = self.center_y + (target_y - center_y) * self.tile_size
+    def lat_lon_to_xy_batch(self, lats, lons):
+        """Vectorized lat_lon_to_xy for arrays of coordinates.
 
-        return pixel_x, pixel_y
+        One NumPy pass over all points, reusing the cached center
+        projection; use this when placing whole polygons or point sets
+        rather than calling the scalar version in a loop.
+        """
+        target_x, target_y = _merc_forward_v(
+            np.asarray(lats, dtype=np.float64),
+            np.asarray(lons, dtype=np.float64), self._n)
 
-    def xy_to_lat_lon(self, x, y):
-        """Convert widget pixel coordinates to lat/lon"""
-        pixel_offset_x = x - self.center_x
-        pixel_offset_y = y - self.center_y
+        pixel_x = self.center_x + (target_x - self._cx_merc) * self.tile_size
+        pixel_y = self.center_y + (target_y - self._cy_merc) * self.tile_size
 
-        tile_offset_x = pixel_offset_x / self.tile_size
-        tile_offset_y = pixel_offset_y / self.tile_size
+        return pixel_x, pixel_y
 
-        n = 2.0 ** self.zoom
-        center_x = (self.lon + 180.0) / 360.0 * n
-        center_y = (1.0 - log(tan(radians(self.lat)) + sec(radians(self.lat))) / pi) / 2.0 * n
+    def xy_to_lat_lon_batch(self, xs, ys):
+        """Vectorized xy_to_lat_lon for arrays of pixel coordinates."""
+        target_x = self._cx_merc + (np.asarray(xs, dtype=np.float64) - self.center_x) / self.tile_size
+        target_y = self._cy_merc + (np.asarray(ys, dtype=np.float64) - self.center_y) / self.tile_size
+        return _merc_inverse_v(target_x, target_y, self._n)
 
-        target_x = center_x + tile_offset_x
-        target_y = center_y + tile_offset_y
+    def xy_to_lat_lon(self, x, y):
+        """Convert widget pixel coordinates to lat/lon"""
+        target_x = self._cx_merc + (x - self.center_x) / self.tile_size
+        target_y = self._cy_merc + (y - self.center_y) / self.tile_size
 
-        lon = target_x / n * 360.0 - 180.0
-        lat_rad = atan(sinh(pi * (1 - 2 * target_y / n)))
+        lon = target_x / self._n * 360.0 - 180.0
+        lat_rad = atan(sinh(pi * (1 - 2 * target_y / self._n)))
         lat = lat_rad * 180.0 / pi
 
         return lat, lon
@@ -153,81 +252,122 @@ class OfflineMap(Widget):
 
         center_tile_x, center_tile_y = lat_lon_to_tile(self.lat, self.lon, self.zoom)
 
-        tiles_x = ceil(self.width / self.tile_size) + 2
-        tiles_y = ceil(self.height / self.tile_size) + 2
+        # Tiles needed to cover each half-extent, plus one margin tile for
+        # the center tile's sub-tile offset; pure integer arithmetic.
+        half_x = (int(self.width) + self.tile_size - 1) // (2 * self.tile_size) + 1
+        half_y = (int(self.height) + self.tile_size - 1) // (2 * self.tile_size) + 1
 
-        min_tile_x = int(center_tile_x - tiles_x // 2)
-        max_tile_x = int(center_tile_x + tiles_x // 2)
-        min_tile_y = int(center_tile_y - tiles_y // 2)
-        max_tile_y = int(center_tile_y + tiles_y // 2)
-
-        tiles = []
         max_tile_coord = 2 ** self.zoom
+        y_range = range(max(0, center_tile_y - half_y),
+                        min(max_tile_coord, center_tile_y + half_y + 1))
 
-        for tile_x in range(min_tile_x, max_tile_x + 1):
-            for tile_y in range(min_tile_y, max_tile_y + 1):
-                wrapped_x = tile_x % max_tile_coord
-                if 0 <= tile_y < max_tile_coord:
-                    tiles.append((wrapped_x, tile_y, tile_x, tile_y))
-
-        return tiles
+        return [(tile_x % max_tile_coord, tile_y, tile_x, tile_y)
+                for tile_x in range(center_tile_x - half_x, center_tile_x + half_x + 1)
+                for tile_y in y_range]
 
     def redraw_map(self, *args):
         """Redraw the map with current tiles"""
-        self.canvas.clear()
-
         if self.width <= 0 or self.height <= 0:
             return
 
+        self._bg_rect.pos = self.pos
+        self._bg_rect.size = self.size
+
         visible_tiles = self.get_visible_tiles()
+        if not visible_tiles:
+            return
         center_tile_x, center_tile_y = lat_lon_to_tile(self.lat, self.lon, self.zoom)
 
-        with self.canvas:
-            Color(0.9, 0.9, 0.9, 1)
-            Rectangle(pos=self.pos, size=self.size)
-
-            for wrapped_x, tile_y, original_x, original_y in visible_tiles:
-                tile_offset_x = original_x - center_tile_x
-                tile_offset_y = original_y - center_tile_y
-
-                tile_pos_x = self.center_x + (tile_offset_x * self.tile_size) - self.tile_size // 2
-                tile_pos_y = self.center_y - (tile_offset_y * self.tile_size) - self.tile_size // 2
-
-                tile_path = self.get_tile_image(wrapped_x, tile_y, self.zoom)
-
-                if tile_path and os.path.exists(tile_path):
-                    try:
-                        texture = CoreImage(tile_path).texture
-                        Color(1, 1, 1, 1)
-                        Rectangle(texture=texture, pos=(tile_pos_x, tile_pos_y), 
-                                size=(self.tile_size, self.tile_size))
-                    except Exception as e:
-                        Color(0.8, 0.8, 0.8, 1)
-                        Rectangle(pos=(tile_pos_x, tile_pos_y), 
-                                size=(self.tile_size, self.tile_size))
-                else:
-                    Color(0.7, 0.7, 0.7, 1)
-                    Rectangle(pos=(tile_pos_x, tile_pos_y), 
-                            size=(self.tile_size, self.tile_size))
-
-                    Clock.schedule_once(
-                        lambda dt, x=wrapped_x, y=tile_y, z=self.zoom: 
-                        self.download_tile_async(x, y, z), 0.1
-                    )
+        # Screen positions for all tiles in two broadcast expressions
+        # instead of per-tile int arithmetic in the loop.
+        tiles_arr = np.asarray(visible_tiles)
+        half_tile = self.tile_size // 2
+        pos_xs = self.center_x + (tiles_arr[:, 2] - center_tile_x) * self.tile_size - half_tile
+        pos_ys = self.center_y - (tiles_arr[:, 3] - center_tile_y) * self.tile_size - half_tile
+
+        seen = set()
+        for (wrapped_x, tile_y, _, _), tile_pos_x, tile_pos_y in zip(
+                visible_tiles, pos_xs, pos_ys):
+            key = (wrapped_x, tile_y, self.zoom)
+            seen.add(key)
+
+            slot = self._tile_rects.get(key)
+            if slot is None:
+                color = Color(0.7, 0.7, 0.7, 1)
+                rect = Rectangle(size=(self.tile_size, self.tile_size))
+                self._tile_ig.add(color)
+                self._tile_ig.add(rect)
+                slot = [color, rect, None]
+                self._tile_rects[key] = slot
+
+            color, rect, current_texture = slot
+            rect.pos = (tile_pos_x, tile_pos_y)
+
+            if current_texture is not None:
+                continue
+
+            tile_path = self.get_tile_image(wrapped_x, tile_y, self.zoom)
+            if tile_path:
+                try:
+                    texture = _load_texture(tile_path)
+                except Exception:
+                    # Corrupt file on disk: keep a slightly different grey
+                    # and don't re-fetch (the file exists).
+                    color.rgba = (0.8, 0.8, 0.8, 1)
+                    continue
+                rect.texture = texture
+                color.rgba = (1, 1, 1, 1)
+                slot[2] = texture
+            else:
+                self.download_tile_async(wrapped_x, tile_y, self.zoom)
+
+        # Drop slots that scrolled out of view (or belong to another zoom).
+        for key in list(self._tile_rects):
+            if key not in seen:
+                color, rect, _ = self._tile_rects.pop(key)
+                self._tile_ig.remove(color)
+                self._tile_ig.remove(rect)
 
     def get_tile_image(self, x, y, zoom):
         """Get path to tile image file"""
         tile_path = os.path.join(self.tiles_path, str(zoom), str(x), f"{y}.png")
-        return tile_path if os.path.exists(tile_path) else None
+        # Tiles never disappear once on disk, so remember the positive
+        # answers and skip the stat() per tile per frame.
+        if tile_path in self._known_tiles:
+            return tile_path
+        if os.path.exists(tile_path):
+            self._known_tiles.add(tile_path)
+            return tile_path
+        return None
 
     def download_tile_async(self, x, y, zoom):
-        """Download tile asynchronously and refresh map"""
-        try:
-            tile_path = download_tile(x, y, zoom, self.tiles_path)
+        """Fetch a tile on the worker pool and refresh the map when done"""
+        key = (x, y, zoom)
+        if key in self._inflight_tiles:
+            return
+        # Every frame over an uncached area would otherwise re-request the
+        # same failing tile; back off before retrying it.
+        retry_after = self._failed_tiles.get(key)
+        if retry_after is not None and time.monotonic() < retry_after:
+            return
+        self._inflight_tiles.add(key)
+
+        def _on_done(future):
+            self._inflight_tiles.discard(key)
+            try:
+                tile_path = future.result()
+            except Exception as e:
+                tile_path = None
+                print(f"Async tile download failed: {e}")
             if tile_path:
-                Clock.schedule_once(self.redraw_map, 0.1)
-        except Exception as e:
-            print(f"Async tile download failed: {e}")
+                self._failed_tiles.pop(key, None)
+                self._known_tiles.add(tile_path)
+                self._redraw_trigger()
+            else:
+                self._failed_tiles[key] = time.monotonic() + self._retry_cooldown_s
+
+        future = _TILE_POOL.submit(download_tile, x, y, zoom, self.tiles_path)
+        future.add_done_callback(_on_done)
 
     def on_touch_down(self, touch):
         """Handle touch start for panning"""
@@ -291,11 +431,19 @@ def preload_delhi_tiles():
     zoom_levels = [9, 10, 11]
 
     print("Pre-loading Delhi map tiles...")
+    # Fan the 27 fetches out on the shared pool; the token bucket in
+    # download_tile keeps the aggregate rate polite, but the network
+    # latencies overlap instead of serializing.
+    futures = []
     for zoom in zoom_levels:
         center_x, center_y = lat_lon_to_tile(delhi_center[0], delhi_center[1], zoom)
         for dx in [-1, 0, 1]:
             for dy in [-1, 0, 1]:
-                try:
-                    download_tile(center_x + dx, center_y + dy, zoom)
-                except Exception as e:
-                    print(f"Preload failed: {e}")
\ No newline at end of file
+                futures.append(_TILE_POOL.submit(
+                    download_tile, center_x + dx, center_y + dy, zoom))
+
+    for future in futures:
+        try:
+            future.result()
+        except Exception as e:
+            print(f"Preload failed: {e}")
\ No newline at end of file
@@ -1,6 +1,46 @@
+import logging
 import math
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Casualty zones hottest-first: fireball, 20/5/2/1 psi rings, then the
+# thermal and radiation annuli beyond the 1 psi ring. The fraction vectors
+# are aligned with the radius rows so one dot product yields each total.
+_RADIUS_COEFFS = np.array([0.44, 1.3, 4.5, 8.0, 13.0, 0.9, 0.65])
+_RADIUS_EXPONENTS = np.array([0.4, 0.33, 0.33, 0.33, 0.33, 0.41, 0.19])
+_FATALITY_FRACTIONS = np.array([1.0, 0.98, 0.65, 0.15, 0.03, 0.40, 0.45])
+_INJURY_FRACTIONS = np.array([0.0, 0.02, 0.30, 0.60, 0.45, 0.55, 0.40])
+ZONE_NAMES = ("fireball", "psi_20", "psi_5", "psi_2", "psi_1",
+              "thermal_only", "radiation_only")
+
+def _casualties_core(Y_MT, effective_density):
+    """Pure-numeric casualty core; dict assembly and printing stay outside
+    so the whole thing can be nopython-compiled when numba is present."""
+    radii = _RADIUS_COEFFS * Y_MT ** _RADIUS_EXPONENTS
+    disk_areas = np.pi * radii ** 2
+
+    zone_areas = np.empty(7)
+    zone_areas[0] = disk_areas[0]
+    for i in range(1, 5):
+        zone_areas[i] = disk_areas[i] - disk_areas[i - 1]
+    for i in range(5, 7):
+        zone_areas[i] = max(0.0, disk_areas[i] - disk_areas[4])
+
+    zone_pops = zone_areas * effective_density
+    return (radii, zone_areas, zone_pops,
+            zone_pops * _FATALITY_FRACTIONS, zone_pops * _INJURY_FRACTIONS)
+
+if NUMBA_AVAILABLE:
+    _casualties_core = njit(cache=True, fastmath=True)(_casualties_core)
+    _casualties_core(0.001, 1000.0)  # warm the JIT at import time
+
 def calculate_casualties(yield_kt, population_density=25000):
     """
     Enhanced casualty calculation based on NUKEMAP methodology with more realistic scaling.
@@ -16,111 +56,47 @@ def calculate_casualties(yield_kt, population_density=25000):
     if yield_kt <= 0:
         return {"fatalities": 0, "injuries": 0}
 
-    print(f"Calculating casualties for {yield_kt}kt weapon, density {population_density}/km²")
+    logger.debug("Calculating casualties for %skt weapon, density %s/km²",
+                 yield_kt, population_density)
 
     effective_density = population_density * 1.5  
 
-    Y_MT = yield_kt / 1000.0  
-
-    fireball_radius = 0.44 * (Y_MT ** 0.4)
-    psi_20_radius = 1.3 * (Y_MT ** 0.33)     
-
-    psi_5_radius = 4.5 * (Y_MT ** 0.33)     
-
-    psi_2_radius = 8.0 * (Y_MT ** 0.33)     
-
-    psi_1_radius = 13.0 * (Y_MT ** 0.33)    
-# Light damage
-
-    thermal_radius = 0.9 * (Y_MT ** 0.41)
-
-    radiation_radius = 0.65 * (Y_MT ** 0.19)
-
-    print(f"Blast radii: 20psi={psi_20_radius:.2f}km, 5psi={psi_5_radius:.2f}km, 2psi={psi_2_radius:.2f}km")
-
-    area_fireball = math.pi * (fireball_radius ** 2)
-    area_20_psi = math.pi * (psi_20_radius ** 2) - area_fireball
-    area_5_psi = math.pi * (psi_5_radius ** 2) - math.pi * (psi_20_radius ** 2)
-    area_2_psi = math.pi * (psi_2_radius ** 2) - math.pi * (psi_5_radius ** 2)
-    area_1_psi = math.pi * (psi_1_radius ** 2) - math.pi * (psi_2_radius ** 2)
-    area_thermal = math.pi * (thermal_radius ** 2)
-    area_radiation = math.pi * (radiation_radius ** 2)
-
-    print(f"Areas: fireball={area_fireball:.2f}km², 20psi={area_20_psi:.2f}km², 5psi={area_5_psi:.2f}km²")
-
-    pop_fireball = area_fireball * effective_density
-    pop_20_psi = area_20_psi * effective_density
-    pop_5_psi = area_5_psi * effective_density
-    pop_2_psi = area_2_psi * effective_density
-    pop_1_psi = area_1_psi * effective_density
-
-    print(f"Populations: fireball={pop_fireball:.0f}, 20psi={pop_20_psi:.0f}, 5psi={pop_5_psi:.0f}")
-
-    fatalities_fireball = pop_fireball * 1.0
-    injuries_fireball = 0  
+    Y_MT = yield_kt / 1000.0
 
-    fatalities_20_psi = pop_20_psi * 0.98
-    injuries_20_psi = pop_20_psi * 0.02
+    # Blast zones are concentric rings; thermal/radiation only count the
+    # annulus beyond the 1 psi disk so nobody is double-counted.
+    radii, zone_areas, zone_pops, zone_fatalities, zone_injuries = \
+        _casualties_core(Y_MT, effective_density)
 
-    fatalities_5_psi = pop_5_psi * 0.65
-    injuries_5_psi = pop_5_psi * 0.30
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Blast radii: 20psi=%.2fkm, 5psi=%.2fkm, 2psi=%.2fkm",
+                     radii[1], radii[2], radii[3])
+        logger.debug("Areas: fireball=%.2fkm², 20psi=%.2fkm², 5psi=%.2fkm²",
+                     zone_areas[0], zone_areas[1], zone_areas[2])
+        logger.debug("Populations: fireball=%.0f, 20psi=%.0f, 5psi=%.0f",
+                     zone_pops[0], zone_pops[1], zone_pops[2])
 
-    fatalities_2_psi = pop_2_psi * 0.15
-    injuries_2_psi = pop_2_psi * 0.60
+    final_fatalities = int(zone_fatalities.sum())
+    final_injuries = int(zone_injuries.sum())
+    total_affected = int(zone_pops.sum())
 
-    fatalities_1_psi = pop_1_psi * 0.03
-    injuries_1_psi = pop_1_psi * 0.45
+    logger.debug("Final casualties: %s fatalities, %s injuries",
+                 f"{final_fatalities:,}", f"{final_injuries:,}")
 
-    thermal_only_area = max(0, area_thermal - math.pi * (psi_1_radius ** 2))
-    thermal_only_pop = thermal_only_area * effective_density
-
-    thermal_fatalities = thermal_only_pop * 0.40  
-
-    thermal_injuries = thermal_only_pop * 0.55    
-
-    radiation_only_area = max(0, area_radiation - math.pi * (psi_1_radius ** 2))
-    radiation_only_pop = radiation_only_area * effective_density
-
-    radiation_fatalities = radiation_only_pop * 0.45  
-
-    radiation_injuries = radiation_only_pop * 0.40    
-
-    total_blast_fatalities = (fatalities_fireball + fatalities_20_psi + 
-                             fatalities_5_psi + fatalities_2_psi + fatalities_1_psi)
-
-    total_blast_injuries = (injuries_fireball + injuries_20_psi + 
-                           injuries_5_psi + injuries_2_psi + injuries_1_psi)
-
-    final_fatalities = int(total_blast_fatalities + thermal_fatalities + radiation_fatalities)
-    final_injuries = int(total_blast_injuries + thermal_injuries + radiation_injuries)
-
-    total_affected = int(pop_fireball + pop_20_psi + pop_5_psi + pop_2_psi + pop_1_psi + 
-                        thermal_only_pop + radiation_only_pop)
-
-    print(f"Final casualties: {final_fatalities:,} fatalities, {final_injuries:,} injuries")
+    radius_keys = ("fireball_km", "psi_20_km", "psi_5_km", "psi_2_km",
+                   "psi_1_km", "thermal_km", "radiation_km")
 
     return {
         "fatalities": final_fatalities,
         "injuries": final_injuries,
         "total_affected": total_affected,
-        "blast_radii": {
-            "fireball_km": round(fireball_radius, 2),
-            "psi_20_km": round(psi_20_radius, 2),
-            "psi_5_km": round(psi_5_radius, 2),
-            "psi_2_km": round(psi_2_radius, 2),
-            "psi_1_km": round(psi_1_radius, 2),
-            "thermal_km": round(thermal_radius, 2),
-            "radiation_km": round(radiation_radius, 2)
-        },
-        "casualties_by_zone": {
-            "fireball": {"fatalities": int(fatalities_fireball), "injuries": int(injuries_fireball)},
-            "psi_20": {"fatalities": int(fatalities_20_psi), "injuries": int(injuries_20_psi)},
-            "psi_5": {"fatalities": int(fatalities_5_psi), "injuries": int(injuries_5_psi)},
-            "psi_2": {"fatalities": int(fatalities_2_psi), "injuries": int(injuries_2_psi)},
-            "psi_1": {"fatalities": int(fatalities_1_psi), "injuries": int(injuries_1_psi)},
-            "thermal_only": {"fatalities": int(thermal_fatalities), "injuries": int(thermal_injuries)},
-            "radiation_only": {"fatalities": int(radiation_fatalities), "injuries": int(radiation_injuries)}
-        }
+        "blast_radii": {key: round(float(r), 2)
+                        for key, r in zip(radius_keys, radii)},
+        # Per-zone breakdown as parallel arrays aligned with zone_names
+        # (truncated to ints like the totals).
+        "zone_names": ZONE_NAMES,
+        "fatalities_by_zone": zone_fatalities.astype(np.int64),
+        "injuries_by_zone": zone_injuries.astype(np.int64),
     }
 
 DELHI_POPULATION_DENSITIES = {
@@ -2,6 +2,12 @@
 
 import numpy as np
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 ATMOSPHERE_DATA = np.array([
     [0.0, 288.15, 101325.0, 1.2250, 1.789e-5],
     [1.0, 281.65, 89874.6,  1.1116, 1.758e-5],
@@ -26,41 +32,70 @@ ATMOSPHERE_DATA = np.array([
     [20.0, 216.65, 5474.9,  0.0880, 1.422e-5]
 ])
 
+# Pre-sliced contiguous columns so each lookup interpolates without
+# re-slicing the table (and re-allocating four views) per call.
+_ALT_KM = np.ascontiguousarray(ATMOSPHERE_DATA[:, 0])
+_TEMP_K = np.ascontiguousarray(ATMOSPHERE_DATA[:, 1])
+_PRES_PA = np.ascontiguousarray(ATMOSPHERE_DATA[:, 2])
+_DENS_KG_M3 = np.ascontiguousarray(ATMOSPHERE_DATA[:, 3])
+_VISC_PA_S = np.ascontiguousarray(ATMOSPHERE_DATA[:, 4])
+
+def _atm_lookup(alt_m, alt_km_arr, temps, pres, dens, visc):
+    """Scalar table lookup: one binary search, all four columns
+    interpolated inline (nopython-compilable)."""
+    alt_km = alt_m * 1e-3
+    if alt_km < alt_km_arr[0]:
+        alt_km = alt_km_arr[0]
+    elif alt_km > alt_km_arr[-1]:
+        alt_km = alt_km_arr[-1]
+
+    idx = np.searchsorted(alt_km_arr, alt_km) - 1
+    if idx < 0:
+        idx = 0
+    elif idx > alt_km_arr.shape[0] - 2:
+        idx = alt_km_arr.shape[0] - 2
+
+    t = (alt_km - alt_km_arr[idx]) / (alt_km_arr[idx + 1] - alt_km_arr[idx])
+    return (temps[idx] + t * (temps[idx + 1] - temps[idx]),
+            pres[idx] + t * (pres[idx + 1] - pres[idx]),
+            dens[idx] + t * (dens[idx + 1] - dens[idx]),
+            visc[idx] + t * (visc[idx + 1] - visc[idx]))
+
+if NUMBA_AVAILABLE:
+    _atm_lookup = njit(cache=True)(_atm_lookup)
+
 def get_atmospheric_properties(altitude_m):
     """
     Interpolates atmospheric properties for a given altitude.
     Altitude should be in meters.
     Returns a dictionary of properties.
     """
-    altitude_km = altitude_m / 1000.0
-    
-    # Use numpy's interpolation function
-    altitudes = ATMOSPHERE_DATA[:, 0]
-    
-    # Handle cases outside the data range by clamping to the nearest edge
-    if altitude_km <= altitudes[0]:
-        return {
-            'temperature_k': ATMOSPHERE_DATA[0, 1],
-            'pressure_pa': ATMOSPHERE_DATA[0, 2],
-            'density_kg_m3': ATMOSPHERE_DATA[0, 3],
-            'viscosity_pa_s': ATMOSPHERE_DATA[0, 4]
-        }
-    if altitude_km >= altitudes[-1]:
-        return {
-            'temperature_k': ATMOSPHERE_DATA[-1, 1],
-            'pressure_pa': ATMOSPHERE_DATA[-1, 2],
-            'density_kg_m3': ATMOSPHERE_DATA[-1, 3],
-            'viscosity_pa_s': ATMOSPHERE_DATA[-1, 4]
-        }
-        
-    temp = np.interp(altitude_km, altitudes, ATMOSPHERE_DATA[:, 1])
-    pressure = np.interp(altitude_km, altitudes, ATMOSPHERE_DATA[:, 2])
-    density = np.interp(altitude_km, altitudes, ATMOSPHERE_DATA[:, 3])
-    viscosity = np.interp(altitude_km, altitudes, ATMOSPHERE_DATA[:, 4])
-    
+    temp, pressure, density, viscosity = _atm_lookup(
+        float(altitude_m), _ALT_KM, _TEMP_K, _PRES_PA, _DENS_KG_M3, _VISC_PA_S)
+
     return {
         'temperature_k': temp,
         'pressure_pa': pressure,
         'density_kg_m3': density,
         'viscosity_pa_s': viscosity
+    }
+
+def get_atmospheric_properties_batch(altitudes_m):
+    """
+    Vectorized lookup for an array of altitudes (meters).
+    One searchsorted locates every altitude's table segment, then all
+    four properties interpolate from the shared indices; returns a
+    dictionary of arrays aligned with the input.
+    """
+    alt_km = np.clip(np.asarray(altitudes_m, dtype=float) / 1000.0,
+                     _ALT_KM[0], _ALT_KM[-1])
+
+    idx = np.clip(np.searchsorted(_ALT_KM, alt_km) - 1, 0, len(_ALT_KM) - 2)
+    t = (alt_km - _ALT_KM[idx]) / (_ALT_KM[idx + 1] - _ALT_KM[idx])
+
+    return {
+        'temperature_k': _TEMP_K[idx] + t * (_TEMP_K[idx + 1] - _TEMP_K[idx]),
+        'pressure_pa': _PRES_PA[idx] + t * (_PRES_PA[idx + 1] - _PRES_PA[idx]),
+        'density_kg_m3': _DENS_KG_M3[idx] + t * (_DENS_KG_M3[idx + 1] - _DENS_KG_M3[idx]),
+        'viscosity_pa_s': _VISC_PA_S[idx] + t * (_VISC_PA_S[idx + 1] - _VISC_PA_S[idx])
     }
\ No newline at end of file
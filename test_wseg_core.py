@@ -0,0 +1,48 @@
+"""Regression test for the SciPy-optional WSEG grid path.
+
+The cumnor fallback is built from np.frompyfunc, which yields
+object-dtype arrays unless the result is coerced back to float64; if
+that coercion is lost, calculate_dose_rate_grid raises TypeError on
+every call whenever SciPy is absent. SciPy is installed in the normal
+environment, so the test blocks it in a subprocess and runs the grid
+there.
+"""
+
+import subprocess
+import sys
+import unittest
+
+_NO_SCIPY_SCRIPT = """\
+import sys
+sys.modules['scipy'] = None
+sys.modules['scipy.special'] = None
+
+import numpy as np
+import wseg_core
+
+assert not wseg_core.SCIPY_AVAILABLE
+
+_, p = wseg_core.calculate_isodose_contour_dimensions(20, 24, 'Ground')
+X, Y = np.meshgrid(np.linspace(-5.0, 60.0, 40), np.linspace(-10.0, 10.0, 30))
+grid = wseg_core.calculate_dose_rate_grid(X, Y, p)
+
+assert grid.dtype == np.float64, grid.dtype
+assert np.isfinite(grid).all()
+assert grid.max() > 0.0
+
+# 0-d/scalar inputs must survive the fallback too.
+assert isinstance(wseg_core.cumnor(0.5), float) or \\
+    np.asarray(wseg_core.cumnor(0.5)).dtype == np.float64
+"""
+
+
+class TestCumnorFallback(unittest.TestCase):
+
+    def test_grid_works_without_scipy(self):
+        result = subprocess.run([sys.executable, '-c', _NO_SCIPY_SCRIPT],
+                                capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,278 +1,432 @@
+import logging
 import math
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+log = logging.getLogger(__name__)
 
 try:
-    from scipy.stats import norm
+    from scipy.special import ndtr
     SCIPY_AVAILABLE = True
 except ImportError:
     SCIPY_AVAILABLE = False
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
 KPH_TO_MPH = 0.621371
 MI_TO_KM = 1.60934
 KFT_TO_MI = 1.0 / 5280.0
 
-SNC = 2350.0  
-
-def cumnor(x):
-    if SCIPY_AVAILABLE:
-        return norm.cdf(x)
-    else:
-        return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
-
-def calculate_dose_rate_at_point(x_mi, y_mi, p):
-    """Calculate dose rate at a point using WSEG-10 model"""
-    term1 = p['sigma_o_sq'] * (1.0 + 8.0 * abs(x_mi + 2.0 * p['sigma_x']) / p['L'])
-    term2 = (2.0 / p['L_sq']) * (p['sigma_x'] * p['Tc'] * p['sigma_h_mi'] * p['Sc_mi']) ** 2
-    term3 = (1.0 / (p['L_sq'] ** 2)) * ((x_mi + 2.0 * p['sigma_x']) * p['Lo'] * 
-                                         p['Tc'] * p['sigma_h_mi'] * p['Sc_mi']) ** 2
-
-    sigma_y_sq = term1 + term2 + term3
-
-    if sigma_y_sq <= 0.0:
-        return 0.0
+SNC = 2350.0
 
-    sigma_y = math.sqrt(sigma_y_sq)
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+_INV_SQRT2 = 1.0 / math.sqrt(2.0)
 
-    w = (p['Lo'] / p['L']) * (x_mi / p['sigma_x_adj_for_phi'])
-    phi = cumnor(w)
+# NUKEMAP-calibrated contour scaling table (10 kt reference dimensions
+# and yield exponents), hottest contour first. Zero exponent means the
+# legacy sqrt(yield) scaling.
+_DOSE_LABELS = ('3000', '1000', '300', '100', '30', '10', '3', '1')
 
-    try:
-        exponent = (abs(x_mi) / p['L']) ** p['n']
-        gamma_term = math.gamma(1.0 + 1.0 / p['n'])
-        g_x = math.exp(-exponent) / (p['L'] * gamma_term)
-    except (ValueError, OverflowError, ZeroDivisionError):
-        g_x = 0.0
-
-    fx = p['yield_kt'] * SNC * phi * g_x * p['fission_fraction']
-
-    if fx <= 0.0:
-        return 0.0
+# One row per valid contour, hottest first; columns slice out as
+# contiguous vectors for batched plotting.
+_CONTOUR_DTYPE = np.dtype([('dose', 'i4'), ('length', 'f8'),
+                           ('width', 'f8'), ('max_location_km', 'f8')])
 
-    alpha2_arg = p['wind_mph'] * (1.0 - phi * (2.0 * x_mi / p['wind_mph']))
-    alpha2 = 1.0 / (1.0 + (0.001 * p['Hc_kft'] / p['sigma_o']) * alpha2_arg)
+# Cloud-height and sigma-o correction polynomials in log10(yield),
+# highest degree first for Horner evaluation via np.polyval.
+_HC_COEFS = np.array([0.60, 2.40, 3.50, 20.4, 50.7])
+_AK_COEFS = np.array([0.10, 0.30, -0.40, 0.90])
+_LENGTH_10KT = np.array([5.0, 4.12, 21.0, 27.0, 42.0, 62.7, 85.0, 123.0])
+_WIDTH_10KT = np.array([0.3, 0.82, 1.2, 1.5, 3.0, 4.48, 8.0, 11.8])
+_LENGTH_EXP = np.array([0.40, 0.54, 0.37, 0.36, 0.36, 0.36, 0.37, 0.00])
+_WIDTH_EXP = np.array([0.65, 0.63, 0.68, 0.70, 0.72, 0.70, 0.72, 0.00])
 
-    try:
-        y_normalized = y_mi / (alpha2 * sigma_y)
-        fy = math.exp(-0.5 * y_normalized ** 2) / (math.sqrt(2.0 * math.pi) * sigma_y)
-    except (ValueError, ZeroDivisionError, OverflowError):
-        fy = 0.0
+class WSEGParams(NamedTuple):
+    """Precomputed WSEG-10 parameter set for one burst configuration.
 
-    dose_rate_h1 = fx * fy
-
-    return dose_rate_h1
-
-def calculate_isodose_contour_dimensions(yield_kt, surface_wind_kph, burst_height,
-                                        fission_fraction=1.0, shear_kph_per_km=0.8):
+    Immutable and all-float, so attribute reads are C-level tuple indexing
+    rather than dict hashing, and the whole record can cross into compiled
+    kernels without boxing.
     """
-    Calculate fallout contour dimensions using NUKEMAP-calibrated scaling laws.
-    Calibrated against NUKEMAP data for 10kt and 20kt at 24 km/h wind.
+    yield_kt: float
+    yield_mt: float
+    fission_fraction: float
+    wind_mph: float
+    Sc_mi: float
+    Hc_kft: float
+    sigma_h_kft: float
+    sigma_h_mi: float
+    sigma_o: float
+    sigma_o_sq: float
+    Tc: float
+    Lo: float
+    sigma_x_sq: float
+    sigma_x: float
+    L_sq: float
+    L: float
+    n: float
+    sigma_x_adj_for_phi: float
+    gamma_term: float
+    inv_L_gamma: float
+    term2: float
+    term3_coef: float
+    alpha2_coef: float
+
+if SCIPY_AVAILABLE:
+    # ndtr is the raw standard-normal CDF ufunc: no distribution
+    # object overhead per call, and it accepts arrays directly.
+    cumnor = ndtr
+else:
+    # frompyfunc lifts the scalar math.erf into a ufunc once, so the
+    # fallback handles arrays too and no availability branch runs per call.
+    _erf = np.frompyfunc(math.erf, 1, 1)
+
+    def cumnor(x):
+        # frompyfunc returns object dtype; coerce back to float64 so the
+        # grid path's downstream ufuncs keep working without SciPy.
+        return 0.5 * (1.0 + np.asarray(_erf(x * _INV_SQRT2), dtype=np.float64))
+
+def _dose_rate_kernel(x_mi, y_mi, sigma_o_sq, sigma_x, L, term2, term3_coef,
+                      inv_L_gamma, Lo, yield_kt, fission_fraction, wind_mph,
+                      alpha2_coef, sigma_x_adj_for_phi, n,
+                      _sqrt=math.sqrt, _exp=math.exp, _erf=math.erf):
+    """WSEG-10 point dose, pure scalar math (nopython-compilable).
+
+    Everything that depends only on the parameter set — the constant
+    sigma_y term, the term-3 coefficient, 1/(L*gamma) and the alpha-2
+    coefficient — arrives precomputed, so the per-point work is just the
+    x/y-dependent part. The defensive try/excepts of the old inline
+    version are replaced by explicit guards on the only denominators
+    that can actually vanish. The math functions are pre-bound as
+    defaults so the interpreted path pays one LOAD_FAST per call instead
+    of a global-plus-attribute lookup.
     """
+    x_off = x_mi + 2.0 * sigma_x
+    term1 = sigma_o_sq * (1.0 + 8.0 * abs(x_off) / L)
+    term3 = term3_coef * x_off * x_off
 
-    print(f"\n{'='*60}")
-    print(f"WSEG-10 CALCULATION START (NUKEMAP-Calibrated)")
-    print(f"Yield: {yield_kt} kt | Wind: {surface_wind_kph} km/h | Burst: {burst_height}")
-    print(f"{'='*60}")
-
-    if burst_height != "Ground":
-        print("⚠ Not a ground burst - returning empty contours")
-        return {}, {}
+    sigma_y_sq = term1 + term2 + term3
 
-    if yield_kt <= 0 or surface_wind_kph <= 0:
-        print("⚠ Invalid yield or wind speed")
-        return {}, {}
+    if sigma_y_sq <= 0.0:
+        return 0.0
 
-    if not (0.0 <= fission_fraction <= 1.0):
-        fission_fraction = 1.0
+    sigma_y = _sqrt(sigma_y_sq)
 
-    p = {}  
+    w = (Lo / L) * (x_mi / sigma_x_adj_for_phi)
+    phi = 0.5 * (1.0 + _erf(w * _INV_SQRT2))
 
-    p['yield_kt'] = float(yield_kt)
-    p['yield_mt'] = p['yield_kt'] / 1000.0
-    p['fission_fraction'] = float(fission_fraction)
-    p['wind_mph'] = float(surface_wind_kph) * KPH_TO_MPH
+    exponent = (abs(x_mi) / L) ** n
+    g_x = _exp(-exponent) * inv_L_gamma
 
-    wind_mph = p['wind_mph']
+    fx = yield_kt * SNC * phi * g_x * fission_fraction
 
-    print(f"\n📊 Parameters:")
-    print(f"   Yield: {yield_kt} kt")
-    print(f"   Wind: {wind_mph:.1f} mph ({surface_wind_kph:.1f} km/h)")
-    print(f"   Fission fraction: {fission_fraction}")
+    if fx <= 0.0:
+        return 0.0
 
-    W = yield_kt  
+    alpha2_arg = wind_mph * (1.0 - phi * (2.0 * x_mi / wind_mph))
+    alpha2_denom = 1.0 + alpha2_coef * alpha2_arg
+    if alpha2_denom == 0.0:
+        return 0.0
+    alpha2 = 1.0 / alpha2_denom
 
-    contour_data = {
+    y_normalized = y_mi / (alpha2 * sigma_y)
+    fy = _exp(-0.5 * y_normalized ** 2) * _INV_SQRT_2PI / sigma_y
 
-        '3000': {
-            'length_10kt': 5.0,    
+    return fx * fy
 
-            'width_10kt': 0.3,     
+if NUMBA_AVAILABLE:
+    _dose_rate_kernel = njit(cache=True, fastmath=True)(_dose_rate_kernel)
 
-            'length_exp': 0.40,
-            'width_exp': 0.65
-        },
-        '1000': {
-            'length_10kt': 4.12,   
+try:
+    # Ahead-of-time build produced by build_aot.py: same kernel, zero
+    # first-call compile latency. Falls back to the JIT (or interpreted)
+    # kernel when the extension has not been built on this machine.
+    from wseg_compiled import dose_rate_kernel as _point_kernel
+except ImportError:
+    _point_kernel = _dose_rate_kernel
+
+def _dose_rate_grid_kernel(X, Y, sigma_o_sq, sigma_x, L, term2, term3_coef,
+                           inv_L_gamma, Lo, yield_kt, fission_fraction,
+                           wind_mph, alpha2_coef, sigma_x_adj_for_phi, n):
+    out = np.empty_like(X)
+    for i in prange(X.shape[0]):
+        for j in range(X.shape[1]):
+            out[i, j] = _dose_rate_kernel(
+                X[i, j], Y[i, j], sigma_o_sq, sigma_x, L, term2, term3_coef,
+                inv_L_gamma, Lo, yield_kt, fission_fraction, wind_mph,
+                alpha2_coef, sigma_x_adj_for_phi, n)
+    return out
+
+if NUMBA_AVAILABLE:
+    _dose_rate_grid_kernel = njit(parallel=True, cache=True, fastmath=True)(
+        _dose_rate_grid_kernel)
+
+def calculate_dose_rate_grid_parallel(X, Y, p):
+    """Dose-rate grid over 2D meshgrid arrays, multithreaded via numba.
+
+    The rows are embarrassingly parallel, so the compiled kernel prange's
+    over them with the GIL released. Without numba, defers to the NumPy
+    broadcast implementation.
+    """
+    if not NUMBA_AVAILABLE:
+        return calculate_dose_rate_grid(X, Y, p)
+    return _dose_rate_grid_kernel(
+        np.ascontiguousarray(X, dtype=np.float64),
+        np.ascontiguousarray(Y, dtype=np.float64),
+        p.sigma_o_sq, p.sigma_x, p.L, p.term2, p.term3_coef,
+        p.inv_L_gamma, p.Lo, p.yield_kt, p.fission_fraction,
+        p.wind_mph, p.alpha2_coef, p.sigma_x_adj_for_phi, p.n)
 
-            'width_10kt': 0.82,    
+def calculate_dose_rate_at_point(x_mi, y_mi, p):
+    """Calculate dose rate at a point using WSEG-10 model"""
+    return _point_kernel(
+        x_mi, y_mi, p.sigma_o_sq, p.sigma_x, p.L, p.term2,
+        p.term3_coef, p.inv_L_gamma, p.Lo, p.yield_kt,
+        p.fission_fraction, p.wind_mph, p.alpha2_coef,
+        p.sigma_x_adj_for_phi, p.n)
+
+def calculate_dose_rate_grid(x_mi, y_mi, p):
+    """Vectorized calculate_dose_rate_at_point over arrays of coordinates.
+
+    Broadcasts the WSEG-10 closed form across `x_mi`/`y_mi` (any mutually
+    broadcastable shapes, e.g. a meshgrid) in one pass, for callers that
+    sweep a region instead of probing single points. Matches the scalar
+    function's guard behavior: non-physical cells come back as 0.
+    """
+    x = np.asarray(x_mi, dtype=float)
+    y = np.asarray(y_mi, dtype=float)
 
-            'length_exp': 0.54,    
+    # Every factor except fy depends on x alone. On a meshgrid each row
+    # of X repeats the same axis, so collapse it to one 1D profile and
+    # evaluate the heavy expressions once per column instead of once per
+    # cell; the results broadcast back over y.
+    if x.ndim == 2 and x.shape[0] > 1 and (x == x[0]).all():
+        x = x[0]
 
-            'width_exp': 0.63      
+    term1 = p.sigma_o_sq * (1.0 + 8.0 * np.abs(x + 2.0 * p.sigma_x) / p.L)
+    term3 = p.term3_coef * (x + 2.0 * p.sigma_x) ** 2
 
-        },
-        '300': {
-            'length_10kt': 21.0,   
+    sigma_y_sq = term1 + p.term2 + term3
 
-            'width_10kt': 1.2,     
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        sigma_y = np.sqrt(np.where(sigma_y_sq > 0.0, sigma_y_sq, np.nan))
 
-            'length_exp': 0.37,
-            'width_exp': 0.68
-        },
-        '100': {
-            'length_10kt': 27.0,   
+        w = (p.Lo / p.L) * (x / p.sigma_x_adj_for_phi)
+        phi = cumnor(w)
 
-            'width_10kt': 1.5,     
+        exponent = (np.abs(x) / p.L) ** p.n
+        g_x = np.exp(-exponent) * p.inv_L_gamma
 
-            'length_exp': 0.36,    
+        fx = p.yield_kt * SNC * phi * g_x * p.fission_fraction
 
-            'width_exp': 0.70      
+        alpha2_arg = p.wind_mph * (1.0 - phi * (2.0 * x / p.wind_mph))
+        alpha2 = 1.0 / (1.0 + p.alpha2_coef * alpha2_arg)
 
-        },
-        '30': {
-            'length_10kt': 42.0,   
+        y_normalized = y / (alpha2 * sigma_y)
+        fy = np.exp(-0.5 * y_normalized ** 2) * _INV_SQRT_2PI / sigma_y
 
-            'width_10kt': 3.0,     
+        dose_rate = fx * fy
 
-            'length_exp': 0.36,
-            'width_exp': 0.72
-        },
-        '10': {
-            'length_10kt': 62.7,   
+    return np.where(np.isfinite(dose_rate) & (fx > 0.0), dose_rate, 0.0)
 
-            'width_10kt': 4.48,    
+@lru_cache(maxsize=256)
+def _contours_impl(yield_kt, surface_wind_kph, fission_fraction,
+                   shear_kph_per_km):
+    """Memoized numeric body of calculate_isodose_contour_dimensions.
 
-            'length_exp': 0.36,    
+    Inputs arrive pre-validated and normalized to floats so equal
+    parameter sets hash to the same cache slot. Returns immutable
+    results only: a tuple of (dose_str, length_km, width_km,
+    max_location_km) rows plus the WSEGParams record.
+    """
+    yield_mt = yield_kt / 1000.0
+    wind_mph = surface_wind_kph * KPH_TO_MPH
 
-            'width_exp': 0.70      
+    log.debug("Parameters: yield=%s kt, wind=%.1f mph (%.1f km/h), "
+              "fission fraction=%s",
+              yield_kt, wind_mph, surface_wind_kph, fission_fraction)
 
-        },
-        '3': {
-            'length_10kt': 85.0,   
+    W = yield_kt
 
-            'width_10kt': 8.0,     
+    # Branchless wind correction: slow winds stretch the length and
+    # narrow the width, fast winds do the opposite, with different
+    # slopes on each side of the 15 mph reference. np.where picks the
+    # slope so the same expression vectorizes over wind sweeps.
+    ref_wind_mph = 15.0
+    delta = (wind_mph - ref_wind_mph) / ref_wind_mph
+    wind_factor_length = 1.0 - delta * np.where(delta < 0.0, 0.2, 0.15)
+    wind_factor_width = 1.0 + delta * np.where(delta < 0.0, 0.15, 0.1)
 
-            'length_exp': 0.37,
-            'width_exp': 0.72
-        },
-        '1': {
-            'length_10kt': 123.0,  
+    log.debug("Wind correction: length=%.3f, width=%.3f",
+              wind_factor_length, wind_factor_width)
 
-            'width_10kt': 11.8,    
+    contour_rows = []
 
-            'length_exp': 0.00,    
+    yield_ratio = W / 10.0
+    sqrt_ratio = math.sqrt(yield_ratio)
+
+    # All eight contours in four vectorized expressions; the mask drops
+    # sub-threshold rows before any row is built.
+    lengths_km = np.where(_LENGTH_EXP > 0,
+                          _LENGTH_10KT * yield_ratio ** _LENGTH_EXP,
+                          _LENGTH_10KT * sqrt_ratio) * wind_factor_length
+    widths_km = np.where(_WIDTH_EXP > 0,
+                         _WIDTH_10KT * yield_ratio ** _WIDTH_EXP,
+                         _WIDTH_10KT * sqrt_ratio) * wind_factor_width
+    valid = (lengths_km >= 0.1) & (widths_km >= 0.01)
+
+    for dose_str, length_km, width_km, ok in zip(_DOSE_LABELS, lengths_km,
+                                                 widths_km, valid):
+        if not ok:
+            continue
 
-            'width_exp': 0.00
-        }
-    }
+        log.debug("%s R/hr: length=%.1f km, width=%.1f km",
+                  dose_str, length_km, width_km)
 
-    ref_wind_mph = 15.0
-    if wind_mph < ref_wind_mph:
+        contour_rows.append((dose_str,
+                             round(float(length_km), 1),
+                             round(float(width_km), 1),
+                             round(float(length_km) * 0.3, 1)))
 
-        wind_factor_length = 1.0 + (ref_wind_mph - wind_mph) / ref_wind_mph * 0.2
-        wind_factor_width = 1.0 - (ref_wind_mph - wind_mph) / ref_wind_mph * 0.15
-    else:
+    shear_mph_per_kft = float(shear_kph_per_km) * KPH_TO_MPH * 3.28084
+    Sc_mi = shear_mph_per_kft * KFT_TO_MI
 
-        wind_factor_length = 1.0 - (wind_mph - ref_wind_mph) / ref_wind_mph * 0.15
-        wind_factor_width = 1.0 + (wind_mph - ref_wind_mph) / ref_wind_mph * 0.1
+    log10_Y_kt = math.log10(yield_kt)
+    Hc_kft = float(np.polyval(_HC_COEFS, log10_Y_kt))
 
-    print(f"   Wind correction: length={wind_factor_length:.3f}, width={wind_factor_width:.3f}")
+    sigma_h_kft = 0.125 * Hc_kft
+    sigma_h_mi = sigma_h_kft * KFT_TO_MI
 
-    contours = {}
+    ln_Y_mt = math.log(yield_mt)
+    original_sigma_o = math.exp(0.70 + (ln_Y_mt / 3.0) -
+                                (3.25 / (4.0 + (ln_Y_mt + 5.4) ** 2)))
 
-    print(f"\n🔍 Calculating contours using NUKEMAP-calibrated scaling...")
+    AK = float(np.polyval(_AK_COEFS, log10_Y_kt))
 
-    yield_ratio = W / 10.0
+    sigma_o = max(original_sigma_o * AK, 2.0)
 
-    for dose_str, params in contour_data.items():
-        dose_level = int(dose_str)
+    sigma_o_sq = sigma_o ** 2
 
-        if params['length_exp'] > 0:
-            length_km = params['length_10kt'] * (yield_ratio ** params['length_exp'])
-        else:
+    h_term = Hc_kft / 60.0
+    Tc = (1.0573203 * ((12.0 * h_term) - 2.5 * (h_term ** 2)) *
+          (1.0 - 0.5 * math.exp(-(Hc_kft / 25.0) ** 2)))
 
-            length_km = params['length_10kt'] * math.sqrt(yield_ratio)
+    Lo = wind_mph * Tc
+    Lo_sq = Lo ** 2
 
-        if params['width_exp'] > 0:
-            width_km = params['width_10kt'] * (yield_ratio ** params['width_exp'])
-        else:
-            width_km = params['width_10kt'] * math.sqrt(yield_ratio)
+    base_sigma_x_sq = (sigma_o_sq * (Lo_sq + 8.0 * sigma_o_sq) /
+                       (Lo_sq + 2.0 * sigma_o_sq))
+    sigma_x_sq = max(base_sigma_x_sq, 16.0)
 
-        length_km *= wind_factor_length
-        width_km *= wind_factor_width
+    sigma_x = math.sqrt(sigma_x_sq)
 
-        if length_km < 0.1 or width_km < 0.01:
-            continue
+    L_sq = Lo_sq + 2.0 * sigma_x_sq
+    L = math.sqrt(L_sq)
 
-        print(f"\n   {dose_str} R/hr:")
-        print(f"      Length: {length_km:.1f} km")
-        print(f"      Width: {width_km:.1f} km")
+    n = max((Lo_sq + sigma_x_sq) / (Lo_sq + 0.5 * sigma_x_sq), 1.3)
 
-        contours[dose_str] = {
-            'length': round(length_km, 1),
-            'width': round(width_km, 1),
-            'max_dose': dose_level,
-            'max_location_km': round(length_km * 0.3, 1)  
+    alpha1 = 1.0 / (1.0 + (0.001 * Hc_kft * wind_mph) / sigma_o)
+    sigma_x_adj_for_phi = sigma_x / alpha1
 
-        }
+    # Partial evaluation for the point kernel: everything here depends
+    # only on the parameter set, so per-point calls skip the gamma call,
+    # the constant sigma_y term and the repeated coefficient products.
+    # exp(lgamma) never overflows, so no exception handling is needed
+    # around the gamma evaluation for extreme parameter sets.
+    gamma_term = math.exp(math.lgamma(1.0 + 1.0 / n))
+    inv_L_gamma = 1.0 / (L * gamma_term)
+    term2 = (2.0 / L_sq) * (sigma_x * Tc * sigma_h_mi * Sc_mi) ** 2
+    term3_coef = (Lo * Tc * sigma_h_mi * Sc_mi) ** 2 / (L_sq ** 2)
+    alpha2_coef = 0.001 * Hc_kft / sigma_o
 
-    shear_mph_per_kft = float(shear_kph_per_km) * KPH_TO_MPH * 3.28084
-    p['Sc_mi'] = shear_mph_per_kft * KFT_TO_MI
+    p = WSEGParams(
+        yield_kt=yield_kt, yield_mt=yield_mt,
+        fission_fraction=fission_fraction, wind_mph=wind_mph,
+        Sc_mi=Sc_mi, Hc_kft=Hc_kft,
+        sigma_h_kft=sigma_h_kft, sigma_h_mi=sigma_h_mi,
+        sigma_o=sigma_o, sigma_o_sq=sigma_o_sq,
+        Tc=Tc, Lo=Lo,
+        sigma_x_sq=sigma_x_sq, sigma_x=sigma_x,
+        L_sq=L_sq, L=L, n=n,
+        sigma_x_adj_for_phi=sigma_x_adj_for_phi,
+        gamma_term=gamma_term, inv_L_gamma=inv_L_gamma,
+        term2=term2, term3_coef=term3_coef, alpha2_coef=alpha2_coef)
 
-    log10_Y_kt = math.log10(p['yield_kt'])
-    p['Hc_kft'] = (50.7 + 20.4 * log10_Y_kt + 
-                   3.50 * log10_Y_kt ** 2 +
-                   2.40 * log10_Y_kt ** 3 + 
-                   0.60 * log10_Y_kt ** 4)
+    return tuple(contour_rows), p
 
-    p['sigma_h_kft'] = 0.125 * p['Hc_kft']
-    p['sigma_h_mi'] = p['sigma_h_kft'] * KFT_TO_MI
+def calculate_isodose_contour_table(yield_kt, surface_wind_kph, burst_height,
+                                    fission_fraction=1.0, shear_kph_per_km=0.8):
+    """
+    Contour dimensions as one typed record array instead of a dict of
+    per-contour dicts: columns ('dose', 'length', 'width',
+    'max_location_km'), one row per valid contour, hottest first. The
+    array is read-only so the memoized result cannot be mutated by a
+    caller. Returns (table, WSEGParams-or-None).
+    """
+    if burst_height != "Ground" or yield_kt <= 0 or surface_wind_kph <= 0:
+        return np.empty(0, _CONTOUR_DTYPE), None
 
-    ln_Y_mt = math.log(p['yield_mt'])
-    original_sigma_o = math.exp(0.70 + (ln_Y_mt / 3.0) - 
-                                (3.25 / (4.0 + (ln_Y_mt + 5.4) ** 2)))
+    if not (0.0 <= fission_fraction <= 1.0):
+        fission_fraction = 1.0
 
-    AK = (0.90 - 0.40 * log10_Y_kt + 
-          0.30 * log10_Y_kt ** 2 + 
-          0.10 * log10_Y_kt ** 3)
+    contour_rows, p = _contours_impl(float(yield_kt), float(surface_wind_kph),
+                                     float(fission_fraction),
+                                     float(shear_kph_per_km))
 
-    p['sigma_o'] = max(original_sigma_o * AK, 2.0)  
+    table = np.empty(len(contour_rows), _CONTOUR_DTYPE)
+    for i, (dose_str, length_km, width_km, max_location_km) in \
+            enumerate(contour_rows):
+        table[i] = (int(dose_str), length_km, width_km, max_location_km)
+    table.flags.writeable = False
+    return table, p
 
-    p['sigma_o_sq'] = p['sigma_o'] ** 2
+def calculate_isodose_contour_dimensions(yield_kt, surface_wind_kph, burst_height,
+                                        fission_fraction=1.0, shear_kph_per_km=0.8):
+    """
+    Calculate fallout contour dimensions using NUKEMAP-calibrated scaling laws.
+    Calibrated against NUKEMAP data for 10kt and 20kt at 24 km/h wind.
 
-    h_term = p['Hc_kft'] / 60.0
-    p['Tc'] = (1.0573203 * ((12.0 * h_term) - 2.5 * (h_term ** 2)) * 
-               (1.0 - 0.5 * math.exp(-(p['Hc_kft'] / 25.0) ** 2)))
+    Results are memoized on the (normalized) input tuple, so repeated
+    calls with the same parameters — GUI redraws, parameter sweeps —
+    skip the numeric body entirely. This is the dict-of-dicts view;
+    calculate_isodose_contour_table serves the same rows as one typed
+    array for columnar consumers.
+    """
 
-    p['Lo'] = p['wind_mph'] * p['Tc']
-    Lo_sq = p['Lo'] ** 2
+    log.debug("WSEG-10 CALCULATION START (NUKEMAP-Calibrated)")
+    log.debug("Yield: %s kt | Wind: %s km/h | Burst: %s",
+              yield_kt, surface_wind_kph, burst_height)
 
-    base_sigma_x_sq = (p['sigma_o_sq'] * (Lo_sq + 8.0 * p['sigma_o_sq']) / 
-                       (Lo_sq + 2.0 * p['sigma_o_sq']))
-    p['sigma_x_sq'] = max(base_sigma_x_sq, 16.0)  
+    if burst_height != "Ground":
+        log.debug("Not a ground burst - returning empty contours")
+        return {}, None
 
-    p['sigma_x'] = math.sqrt(p['sigma_x_sq'])
+    if yield_kt <= 0 or surface_wind_kph <= 0:
+        log.debug("Invalid yield or wind speed")
+        return {}, None
 
-    p['L_sq'] = Lo_sq + 2.0 * p['sigma_x_sq']
-    p['L'] = math.sqrt(p['L_sq'])
+    if not (0.0 <= fission_fraction <= 1.0):
+        fission_fraction = 1.0
 
-    p['n'] = max((Lo_sq + p['sigma_x_sq']) / (Lo_sq + 0.5 * p['sigma_x_sq']), 1.3)
+    contour_rows, p = _contours_impl(float(yield_kt), float(surface_wind_kph),
+                                     float(fission_fraction),
+                                     float(shear_kph_per_km))
 
-    alpha1 = 1.0 / (1.0 + (0.001 * p['Hc_kft'] * p['wind_mph']) / p['sigma_o'])
-    p['sigma_x_adj_for_phi'] = p['sigma_x'] / alpha1
+    contours = {dose_str: {'length': length_km,
+                           'width': width_km,
+                           'max_dose': int(dose_str),
+                           'max_location_km': max_location_km}
+                for dose_str, length_km, width_km, max_location_km
+                in contour_rows}
 
-    print(f"\n{'='*60}")
-    print(f"WSEG-10 CALCULATION COMPLETE")
-    print(f"Found {len(contours)} valid contours")
-    print(f"{'='*60}\n")
+    log.debug("WSEG-10 calculation complete: %d valid contours", len(contours))
 
     return contours, p
 
@@ -289,6 +443,41 @@ def calculate_integrated_dose(dose_rate_h1, start_hours, end_hours):
     integral = dose_rate_h1 * (1.0 / 0.26) * (start_hours ** -0.26 - end_hours ** -0.26)
     return integral
 
+# JIT the closed form so per-cell callers (sweeping entry/exit times over
+# a grid of points) skip interpreter pow overhead; the popup path works
+# the same either way.
+if NUMBA_AVAILABLE:
+    calculate_integrated_dose = njit(cache=True, fastmath=True)(calculate_integrated_dose)
+
+def _integrated_dose_kernel(dose_rate_h1, start_hours, end_hours, out):
+    # One pow plus a fused exp(log) instead of two pows per element;
+    # -expm1 keeps the difference accurate when start and end are close.
+    for i in prange(dose_rate_h1.shape[0]):
+        d = dose_rate_h1[i]
+        s = start_hours[i]
+        e = end_hours[i]
+        if s <= 0.0 or s >= e or d <= 0.0:
+            out[i] = 0.0
+        else:
+            out[i] = (d / 0.26) * s ** -0.26 * -math.expm1(-0.26 * math.log(e / s))
+
+if NUMBA_AVAILABLE:
+    _integrated_dose_kernel = njit(parallel=True, cache=True, fastmath=True)(
+        _integrated_dose_kernel)
+
+def calculate_integrated_dose_array(dose_rate_h1, start_hours, end_hours):
+    """Element-wise calculate_integrated_dose over broadcastable arrays."""
+    d, s, e = np.broadcast_arrays(
+        np.asarray(dose_rate_h1, dtype=np.float64),
+        np.asarray(start_hours, dtype=np.float64),
+        np.asarray(end_hours, dtype=np.float64))
+    out = np.empty(d.shape)
+    _integrated_dose_kernel(np.ascontiguousarray(d).ravel(),
+                            np.ascontiguousarray(s).ravel(),
+                            np.ascontiguousarray(e).ravel(),
+                            out.ravel())
+    return out
+
 if __name__ == "__main__":
     print("WSEG-10 TEST - NUKEMAP-Calibrated")
     print("=" * 70)